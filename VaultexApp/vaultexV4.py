@@ -3,9 +3,29 @@ import yfinance as yf
 import plotly.graph_objs as go
 import feedparser
 from datetime import datetime
+import numpy as np
 import pandas as pd
 import hashlib
+import os
 import time
+from vaultex_archive import HistoryArchive
+from vaultex_distribution import binned_distribution
+from vaultex_engine import API_PORT, DEFAULT_LEVERAGE, LEVERAGE_CHOICES, OrderError, TradingEngine, last_close, start_api_server
+from vaultex_events import align_headlines
+from vaultex_execution import OHLCVFillModel, trades_whole_units
+from vaultex_indicators import IndicatorEngine, IndicatorError
+from vaultex_leaderboard import Leaderboard
+from vaultex_money import from_minor
+from vaultex_news import NewsArchive
+from vaultex_optimizer import optimize, rebalance_orders
+from vaultex_options import CONTRACT_SIZE, analyze_chain, is_contract, years_to_expiry
+from vaultex_patterns import PATTERNS, PatternScanner
+from vaultex_portfolio import CorrelationMatrix, EquityCurve, align_closes, rebase
+from vaultex_seasonality import Seasonality
+from vaultex_sentiment import SentimentCache, label as sentiment_label
+from vaultex_simulation import make_pool, simulate
+from vaultex_volatility import VOL_WINDOWS, atr, periods_per_year, position_size, vol_cone
+from vaultex_volume import VolumeOverlay
 
 # --- 1. PAGE CONFIGURATION & CUSTOM CSS ---
 st.set_page_config(page_title="Vaultex Pro Terminal", layout="wide", page_icon="⚡")
@@ -157,16 +177,34 @@ if 'authenticated' not in st.session_state:
     st.session_state.authenticated = False
 if 'username' not in st.session_state:
     st.session_state.username = None
-if 'balance' not in st.session_state:
-    st.session_state.balance = 25000.0
-if 'holdings' not in st.session_state:
-    st.session_state.holdings = {}
-if 'log' not in st.session_state:
-    st.session_state.log = []
 if 'watchlist' not in st.session_state:
     st.session_state.watchlist = ['BTC-USD', 'ETH-USD', 'AAPL', 'TSLA']
+if 'ticker_input' not in st.session_state:
+    st.session_state.ticker_input = "BTC-USD"  # set here, not via value=, so watchlist clicks can write it
 if 'last_refresh' not in st.session_state:
     st.session_state.last_refresh = time.time()
+if 'basket_orders' not in st.session_state:
+    st.session_state.basket_orders = pd.DataFrame({
+        "Symbol": pd.Series(dtype=str),
+        "Side": pd.Series(dtype=str),
+        "Quantity": pd.Series(dtype=float),
+        "Type": pd.Series(dtype=str),
+        "Limit Price": pd.Series(dtype=float)
+    })
+if 'basket_version' not in st.session_state:
+    st.session_state.basket_version = 0
+if 'order_qty' not in st.session_state:
+    st.session_state.order_qty = 10
+    st.session_state.order_qty_fraction = 0.01   # crypto / FX quantity
+if 'options_symbol' not in st.session_state:
+    st.session_state.options_symbol = None   # symbol whose option expiries were asked for
+    st.session_state.option_chain = None     # ((symbol, expiry), calls, puts, snapshot) last fetched
+if 'equity_curve' not in st.session_state:
+    st.session_state.equity_curve = EquityCurve()
+if 'correlation_matrix' not in st.session_state:
+    st.session_state.correlation_matrix = CorrelationMatrix()
+if 'volume_overlays' not in st.session_state:
+    st.session_state.volume_overlays = {}
 
 # --- 4. LOGIN SYSTEM ---
 def login_page():
@@ -252,30 +290,177 @@ if not st.session_state.authenticated:
     st.stop()
 
 # --- 6. HELPER FUNCTIONS ---
-@st.cache_data(ttl=10)  # Cache for 10 seconds for super fast updates
-def get_current_price(symbol):
-    """Get current price for a symbol with caching"""
+WATCHLIST_PAGE_SIZE = 15
+MAX_COMPARE_SYMBOLS = 20
+
+def _download_bars(symbols, period, interval):
+    """Bars for many symbols in one request, keyed by symbol"""
+    bars = {}
+    if not symbols:
+        return bars
     try:
-        data = yf.Ticker(symbol).history(period="1d")
-        if not data.empty:
-            return float(data['Close'].iloc[-1])
+        data = yf.download(list(symbols), period=period, interval=interval,
+                           group_by="ticker", progress=False, threads=True)
     except:
-        pass
-    return 0.0
-
-def calculate_portfolio_value(holdings, ticker_prices):
-    """Calculate total portfolio value"""
-    total = 0.0
-    for symbol, qty in holdings.items():
-        if qty > 0:
-            try:
-                price = ticker_prices.get(symbol, 0.0)
-                total += qty * price
-            except:
-                pass
-    return total
+        return bars
+    for symbol in symbols:
+        try:
+            df = data[symbol] if isinstance(data.columns, pd.MultiIndex) else data
+            df = df.dropna(subset=["Close"])
+            if not df.empty:
+                bars[symbol] = df
+        except:
+            pass
+    return bars
+
+@st.cache_data(ttl=10)
+def get_batch_bars(symbols, period="1d", interval="5m"):
+    """Intraday bars for many symbols in one request - short TTL, these back live quotes"""
+    return _download_bars(symbols, period, interval)
+
+@st.cache_data(ttl=600)
+def get_history_bars(symbols, period="1y", interval="1d"):
+    """Daily / hourly history for a universe - refetched every 10 minutes, not every rerun"""
+    return _download_bars(symbols, period, interval)
+
+def get_batch_quotes(symbols):
+    """Last price for many symbols from one batched fetch"""
+    bars = get_batch_bars(tuple(symbols))
+    return {symbol: float(bars[symbol]['Close'].iloc[-1]) if symbol in bars else 0.0 for symbol in symbols}
+
+def sparkline(closes, points=40):
+    """Downsample a close series to a short list for a LineChartColumn"""
+    values = closes.to_numpy(dtype=float)
+    step = max(1, len(values) // points)
+    return values[::step].round(4).tolist()
+
+def select_watchlist_symbol():
+    """Switch the main chart to the clicked watchlist row"""
+    rows = st.session_state.watchlist_table.selection.rows
+    if rows and rows[0] < len(st.session_state.watchlist_page):
+        st.session_state.ticker_input = st.session_state.watchlist_page[rows[0]]
+
+@st.cache_resource
+def get_engine():
+    """Shared paper-trading engine; the UI is one client, the HTTP API another"""
+    engine = TradingEngine(price_source=last_close, fill_model=OHLCVFillModel())
+    for username in USERS_DB:
+        engine.account(username)
+    try:
+        start_api_server(engine, port=int(os.environ.get("VAULTEX_API_PORT", API_PORT)))
+    except OSError:
+        pass  # Port already taken - the terminal still works without the API
+    return engine
+
+@st.cache_resource
+def get_leaderboard():
+    """Cross-user leaderboard over the shared engine's position book"""
+    return Leaderboard(get_engine().book, sample_interval=60)
+
+@st.cache_resource
+def get_sentiment_cache():
+    """Headline scores shared by every session - each entry id is scored once"""
+    return SentimentCache()
+
+@st.cache_resource
+def get_news_archive():
+    """Every headline fetched by any session, indexed for search"""
+    return NewsArchive()
+
+@st.cache_data(ttl=300, max_entries=64)
+def get_headlines(symbol):
+    """Yahoo Finance RSS entries for a symbol as plain dicts"""
+    feed = feedparser.parse(f"https://finance.yahoo.com/rss/headline?s={symbol}")
+    fields = ("id", "title", "link", "published", "published_parsed")
+    return [{f: entry.get(f) for f in fields} for entry in feed.entries]
+
+@st.cache_data(ttl=3600, max_entries=64)
+def get_headline_events(symbol, timeframe, news_stamp, bar_stamp, horizon, _headlines, _bars):
+    """Headlines aligned to bars - recomputed for a new headline or a new bar, not every rerun"""
+    return align_headlines(_headlines, _bars, horizon)
+
+@st.cache_resource
+def get_pattern_scanner():
+    """Candlestick pattern flags shared by every session, cached per (symbol, interval, window)"""
+    return PatternScanner()
+
+@st.cache_resource
+def get_indicator_engine():
+    """Shared indicator DAG - expressions compile once, values are cached per (symbol, interval, window)"""
+    return IndicatorEngine()
+
+def split_expressions(text):
+    """One indicator expression per non-empty line"""
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+@st.cache_resource
+def get_archive():
+    """Shared on-disk history archive (memory-mapped, one per server)"""
+    return HistoryArchive()
+
+def load_archived_history(symbol, period, interval="1d"):
+    """Top up the archive with any new bars, then slice the period out of it"""
+    archive = get_archive()
+    archive.sync(symbol, interval, max_age=300)
+    return archive.query(symbol, interval, period)
+
+@st.cache_resource
+def get_seasonality(symbol):
+    """Weekday x hour profile of a symbol's archived 5-minute bars, shared and grown in place"""
+    return Seasonality(bar_seconds=300)
+
+@st.cache_resource
+def get_simulation_pool():
+    """Process pool shared by every session's Monte Carlo runs"""
+    return make_pool()
+
+@st.cache_data(ttl=600, max_entries=64)
+def get_distribution(symbol, timeframe, last_bar, _closes):
+    """Price and return histograms (+ KDE), cached per (symbol, timeframe, last bar)"""
+    closes = _closes.to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(closes) / closes[:-1] * 100
+    return {"Price": binned_distribution(closes), "Returns": binned_distribution(returns)}
+
+@st.cache_data(ttl=3600)
+def get_option_expiries(symbol):
+    """Listed expiries only - chains are fetched one expiry at a time when selected"""
+    try:
+        return tuple(yf.Ticker(symbol).options)
+    except:
+        return ()
+
+@st.cache_data(ttl=60)
+def get_option_chain(symbol, expiry):
+    """(calls, puts, snapshot time) for one expiry"""
+    chain = yf.Ticker(symbol).option_chain(expiry)
+    return chain.calls, chain.puts, time.time()
+
+@st.cache_data(ttl=300, max_entries=32)
+def get_chain_analytics(symbol, expiry, snapshot, spot, rate, _calls, _puts):
+    """IV + greeks for a whole expiry, cached per (expiry, quote snapshot)"""
+    return analyze_chain(_calls, _puts, spot, years_to_expiry(expiry), rate)
+
+@st.cache_data(ttl=300)
+def run_optimizer(closes, max_weight, window, cov):
+    """Efficient frontier for an aligned close frame (cached on its content)"""
+    return optimize(closes, max_weight=max_weight, window=window, cov=cov)
+
+def use_suggested_qty(qty, whole=True):
+    """Copy the position-sizing suggestion into the order form"""
+    if whole:
+        st.session_state.order_qty = max(1, int(qty))
+    else:
+        st.session_state.order_qty_fraction = qty
+
+def calculate_portfolio_value(account, ticker_prices):
+    """Calculate total portfolio value (summed in integer paisa, returned in PKR)"""
+    return from_minor(account.market_value(ticker_prices))
 
 # --- 7. SIDEBAR CONTROLS ---
+engine = get_engine()
+account = engine.account(st.session_state.username)
+
 with st.sidebar:
     # User info at top
     st.markdown(f"""
@@ -288,7 +473,7 @@ with st.sidebar:
     st.title("⚡ Vaultex")
     st.markdown("### Market Controls")
     
-    ticker = st.text_input("SYMBOL", value="BTC-USD", key="ticker_input").upper()
+    ticker = st.text_input("SYMBOL", key="ticker_input").upper()
     period = st.selectbox("TIMEFRAME", ["15m", "1h", "1d", "5d", "1mo", "3mo", "6mo", "1y", "5y"])
     
     # Auto-refresh toggle with dynamic intervals
@@ -332,7 +517,7 @@ with st.sidebar:
             col_submit, col_cancel = st.columns(2)
             with col_submit:
                 if st.form_submit_button("✅ ADD FUNDS", use_container_width=True, type="primary"):
-                    st.session_state.balance += amount
+                    engine.deposit(st.session_state.username, amount)
                     st.session_state.show_add_funds = False
                     st.success(f"✅ PKR {amount:,} added to wallet!")
                     time.sleep(0.5)
@@ -342,13 +527,34 @@ with st.sidebar:
                     st.session_state.show_add_funds = False
                     st.rerun()
     
-    # Calculate portfolio value with fresh data
-    ticker_prices = {}
-    for symbol in st.session_state.holdings.keys():
-        ticker_prices[symbol] = get_current_price(symbol)
+    # Margin account settings
+    with st.expander("📈 Margin & Short Selling", expanded=account.margin):
+        margin_on = st.checkbox("Margin account", value=account.margin, key="margin_toggle")
+        leverage = st.select_slider(
+            "Leverage",
+            options=LEVERAGE_CHOICES,
+            value=account.leverage if account.margin else DEFAULT_LEVERAGE,
+            disabled=not margin_on
+        )
+        if margin_on != account.margin or (margin_on and leverage != account.leverage):
+            try:
+                engine.set_margin(st.session_state.username, margin_on, leverage)
+            except OrderError as e:
+                st.error(f"❌ {e}")
+        if account.margin:
+            margin = account.margin_status()
+            st.caption(f"Equity PKR {margin['equity']:,.0f} • Exposure PKR {margin['exposure']:,.0f}")
+            st.caption(f"Buying Power PKR {margin['buying_power']:,.0f} • Maintenance PKR {margin['maintenance']:,.0f}")
+    
+    # Calculate portfolio value with fresh data. Option contracts have no bars on Yahoo:
+    # they are marked at the last chain quote the engine saw, and kept out of equity universes
+    holdings = account.holdings
+    equity_holdings = {sym: qty for sym, qty in holdings.items() if not is_contract(sym)}
+    ticker_prices = get_batch_quotes(list(equity_holdings))
+    ticker_prices.update({sym: engine.price(sym) for sym in holdings if is_contract(sym)})
     
-    holdings_val = calculate_portfolio_value(st.session_state.holdings, ticker_prices)
-    total_net_worth = st.session_state.balance + holdings_val
+    holdings_val = calculate_portfolio_value(account, ticker_prices)
+    total_net_worth = account.balance + holdings_val
     profit_loss = total_net_worth - 25000.0
     pl_pct = (profit_loss / 25000.0) * 100
     
@@ -358,7 +564,7 @@ with st.sidebar:
         st.markdown(f'<div style="text-align: center; color: #00FF00; font-size: 11px; margin-bottom: 10px;">🔴 LIVE • Next update in {refresh_time_remaining}s</div>', unsafe_allow_html=True)
     
     c1, c2 = st.columns(2)
-    c1.metric("Cash", f"PKR {st.session_state.balance/1000:.1f}K")
+    c1.metric("Cash", f"PKR {account.balance/1000:.1f}K")
     c2.metric("Net Worth", f"PKR {total_net_worth/1000:.1f}K")
     
     # P/L with live indicator
@@ -375,12 +581,58 @@ with st.sidebar:
     
     st.markdown("---")
     
-    # Watchlist with live prices
+    # Watchlist with live prices (one batched fetch per visible page)
     st.markdown("### 👁️ Watchlist")
-    for sym in st.session_state.watchlist[:4]:
-        price = get_current_price(sym)
-        if st.button(f"{sym}: PKR {price:.2f}", key=f"watch_{sym}"):
-            st.rerun()
+    with st.form("watchlist_form", clear_on_submit=True):
+        edit_symbols = st.text_input("Symbols", placeholder="MSFT, NVDA, SOL-USD")
+        col_add, col_rm = st.columns(2)
+        with col_add:
+            add_btn = st.form_submit_button("➕ Add", use_container_width=True)
+        with col_rm:
+            remove_btn = st.form_submit_button("➖ Remove", use_container_width=True)
+    if add_btn or remove_btn:
+        parsed = [s.strip().upper() for s in edit_symbols.replace(" ", ",").split(",") if s.strip()]
+        if add_btn:
+            st.session_state.watchlist += [s for s in dict.fromkeys(parsed) if s not in st.session_state.watchlist]
+        else:
+            st.session_state.watchlist = [s for s in st.session_state.watchlist if s not in parsed]
+    
+    watchlist = st.session_state.watchlist
+    page_count = max(1, -(-len(watchlist) // WATCHLIST_PAGE_SIZE))
+    page = 1
+    if page_count > 1:
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1, key="watchlist_page_num")
+    st.session_state.watchlist_page = watchlist[(page - 1) * WATCHLIST_PAGE_SIZE:page * WATCHLIST_PAGE_SIZE]
+    
+    if st.session_state.watchlist_page:
+        page_bars = get_batch_bars(tuple(st.session_state.watchlist_page))
+        watch_rows = []
+        for sym in st.session_state.watchlist_page:
+            closes = page_bars[sym]['Close'] if sym in page_bars else pd.Series(dtype=float)
+            last = float(closes.iloc[-1]) if len(closes) else 0.0
+            first = float(closes.iloc[0]) if len(closes) else 0.0
+            watch_rows.append({
+                "Symbol": sym,
+                "Price": last,
+                "Chg %": (last - first) / first * 100 if first else 0.0,
+                "Trend": sparkline(closes) if len(closes) else []
+            })
+        st.dataframe(
+            pd.DataFrame(watch_rows),
+            column_config={
+                "Price": st.column_config.NumberColumn("Price", format="%.2f"),
+                "Chg %": st.column_config.NumberColumn("Chg %", format="%+.2f%%"),
+                "Trend": st.column_config.LineChartColumn("Trend", width="small")
+            },
+            hide_index=True,
+            use_container_width=True,
+            on_select=select_watchlist_symbol,
+            selection_mode="single-row",
+            key="watchlist_table"
+        )
+        st.caption(f"{len(watchlist)} symbols • click a row to chart it")
+    else:
+        st.caption("Watchlist is empty.")
     
     st.markdown("---")
     st.markdown('<div class="live-indicator">🟢 LIVE</div>', unsafe_allow_html=True)
@@ -389,9 +641,7 @@ with st.sidebar:
     col_a, col_b = st.columns(2)
     with col_a:
         if st.button("🔄 Reset", use_container_width=True):
-            st.session_state.balance = 25000.0
-            st.session_state.holdings = {}
-            st.session_state.log = []
+            engine.reset(st.session_state.username)
             st.rerun()
     
     with col_b:
@@ -447,9 +697,9 @@ try:
         # For short timeframes with custom intervals
         elif data_interval:
             hist = data.history(period=data_period, interval=data_interval)
-        # For longer timeframes, use default
+        # For longer timeframes, slice daily bars out of the local archive
         else:
-            hist = data.history(period=period)
+            hist = load_archived_history(ticker, period)
     
     if hist.empty:
         st.error("❌ Invalid Symbol or No Data Available")
@@ -467,6 +717,20 @@ try:
     
     color = "#00FF00" if price_change >= 0 else "#FF0000"
     
+    # Headline sentiment for the header badge and the Live Wire (scored once per headline)
+    try:
+        headlines = get_headlines(ticker)
+    except Exception:
+        headlines = None
+    sentiment_cache = get_sentiment_cache()
+    if headlines:
+        headlines = get_news_archive().add(ticker, headlines)  # archived, syndicated copies collapsed
+        sentiment_cache.ingest(ticker, headlines)
+    news_score = sentiment_cache.aggregate(ticker)
+    
+    # Let resting limit orders see the new price
+    engine.on_price(ticker, curr_price)
+    
 except Exception as e:
     st.error(f"❌ Data connection failed: {str(e)}")
     st.stop()
@@ -496,12 +760,16 @@ with col_head3:
     st.metric("52W Low", f"PKR {low_52w:,.2f}")
 
 with col_head4:
-    sentiment = "BULLISH 🐂" if price_change > 0 else "BEARISH 🐻"
-    st.markdown(f"<div style='text-align:center; padding: 10px; border: 1px solid {color}; color: {color}; border-radius: 5px;'>{sentiment}</div>", unsafe_allow_html=True)
+    if news_score is None:
+        sentiment, badge_color = ("BULLISH 🐂" if price_change > 0 else "BEARISH 🐻"), color
+    else:
+        sentiment = f"{sentiment_label(news_score)} {news_score:+.2f}"
+        badge_color = "#00FF00" if news_score >= 0.05 else "#FF0000" if news_score <= -0.05 else "#8B949E"
+    st.markdown(f"<div style='text-align:center; padding: 10px; border: 1px solid {badge_color}; color: {badge_color}; border-radius: 5px;'>{sentiment}</div>", unsafe_allow_html=True)
     st.metric("Avg Volume", f"{avg_volume/1e6:.1f}M")
 
 # Main Workspace Tabs
-tab1, tab2, tab3, tab4 = st.tabs(["📊 CHARTING", "⚡ TRADING CONSOLE", "🧠 INTELLIGENCE", "📈 ANALYTICS"])
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 CHARTING", "⚡ TRADING CONSOLE", "🧠 INTELLIGENCE", "📈 ANALYTICS", "🧾 OPTIONS"])
 
 # --- TAB 1: CHART ---
 with tab1:
@@ -513,6 +781,12 @@ with tab1:
     with chart_col2:
         # Show number of data points
         st.caption(f"📊 {len(hist)} data points")
+        show_vwap = st.checkbox("VWAP ±σ", value=False, key="show_vwap")
+        show_profile = st.checkbox("Volume Profile", value=False, key="show_profile")
+        show_patterns = st.checkbox("Candle Patterns", value=False, key="show_patterns")
+        show_news = st.checkbox("Headlines", value=False, key="show_news")
+        news_horizon = st.number_input("MOVE OVER N BARS", min_value=1, max_value=100, value=5, step=1,
+                                       key="news_horizon", disabled=not show_news)
     
     fig = go.Figure()
     
@@ -545,6 +819,97 @@ with tab1:
             name='Close Price'
         ))
     
+    # Session VWAP bands and volume-at-price, kept incrementally per (symbol, timeframe)
+    if show_vwap or show_profile:
+        overlay = st.session_state.volume_overlays.setdefault((ticker, period), VolumeOverlay())
+        overlay.update(hist)
+    if show_vwap:
+        vwap = overlay.vwap(hist.index)
+        for band, dash in (("Upper 2σ", "dot"), ("Upper 1σ", "dash"), ("Lower 1σ", "dash"), ("Lower 2σ", "dot")):
+            fig.add_trace(go.Scatter(
+                x=hist.index, y=vwap[band], mode='lines', name=band,
+                line=dict(color='rgba(255, 165, 0, 0.6)', width=1, dash=dash)
+            ))
+        fig.add_trace(go.Scatter(
+            x=hist.index, y=vwap['VWAP'], mode='lines', name='VWAP',
+            line=dict(color='#FFA500', width=2)
+        ))
+    profile_max = 0.0
+    if show_profile:
+        profile_price, profile_volume = overlay.profile()
+        if len(profile_volume):
+            profile_max = float(profile_volume.max())
+            fig.add_trace(go.Bar(
+                x=profile_volume, y=profile_price, orientation='h', name='Volume Profile',
+                marker_color='rgba(255, 165, 0, 0.25)', xaxis='x2', hoverinfo='x+y'
+            ))
+    
+    # Candlestick patterns: bullish under the bar, bearish and neutral above it
+    if show_patterns:
+        pattern_flags = get_pattern_scanner().update(hist, ticker, data_interval or "1d", window=period)
+        pad = float(hist['High'].max() - hist['Low'].min()) * 0.015
+        pattern_marks = {"bullish": ('triangle-up', '#00FF00'), "bearish": ('triangle-down', '#FF0000'), "neutral": ('circle', '#C9D1D9')}
+        for name, bias in PATTERNS.items():
+            hits = pattern_flags[name].to_numpy()
+            if not hits.any():
+                continue
+            symbol, marker_color = pattern_marks[bias]
+            y = hist['Low'][hits] - pad if bias == "bullish" else hist['High'][hits] + pad
+            fig.add_trace(go.Scatter(
+                x=hist.index[hits], y=y, mode='markers', name=name,
+                marker=dict(symbol=symbol, size=8, color=marker_color, opacity=0.8),
+                hovertemplate=f'{name}<extra></extra>'
+            ))
+    
+    # Archived headlines pinned to the bar they were published in
+    if show_news:
+        ticker_news = get_news_archive().search("", symbol=ticker, limit=500)
+        news_stamp = (len(ticker_news), ticker_news["Published"].max() if len(ticker_news) else None)
+        events = get_headline_events(ticker, period, news_stamp, (len(hist), hist.index[0], hist.index[-1]),
+                                     int(news_horizon), ticker_news, hist)
+        if not events.empty:
+            fig.add_trace(go.Scatter(
+                x=events['Bar'], y=events['Marker'], mode='markers', name='Headlines',
+                marker=dict(symbol='diamond', size=10, line=dict(width=1, color='#161B22'),
+                            color=np.where(events['Move %'] >= 0, '#00FF00', '#FF0000')),
+                customdata=np.column_stack([events['Title'], events['Move %'], events['Bars']]),
+                hovertemplate='📰 %{customdata[0]}<br>%{customdata[1]:+.2f}% over next %{customdata[2]} bars<extra></extra>'
+            ))
+    
+    # User-defined indicators: numeric results as lines, true/false results as signal markers
+    with st.expander("🧪 Custom Indicators"):
+        indicator_text = st.text_area(
+            "One expression per line",
+            value="ema(close, 12)\nema(close, 26)\ncrossover(ema(close, 12), ema(close, 26))",
+            help="Series: open, high, low, close, volume • Functions: sma, ema, rsi, std, highest, lowest, "
+                 "lag, change, abs, log, sqrt, crossover, crossunder • Operators: + - * / ** > < >= <= == and or not",
+            key="indicator_text"
+        )
+    indicator_values = pd.DataFrame(index=hist.index)
+    try:
+        indicator_values = get_indicator_engine().evaluate(split_expressions(indicator_text), hist, symbol=ticker,
+                                                             interval=data_interval or "1d", window=period)
+    except IndicatorError as e:
+        st.error(f"❌ {e}")
+    price_level = float(hist['Close'].median())
+    uses_y3 = False
+    for expr in indicator_values.columns:
+        series = indicator_values[expr]
+        if series.dtype == bool:
+            hits = hist.index[series.to_numpy()]
+            fig.add_trace(go.Scatter(
+                x=hits, y=hist['Close'][series.to_numpy()], mode='markers',
+                marker=dict(symbol='triangle-up', size=11, color='#FFD700'), name=expr
+            ))
+        else:
+            level = float(series.abs().median()) if series.notna().any() else 0.0
+            on_price = 0.5 * price_level <= level <= 2 * price_level
+            uses_y3 = uses_y3 or not on_price
+            fig.add_trace(go.Scatter(
+                x=hist.index, y=series, mode='lines', line=dict(width=1.5), name=expr,
+                yaxis='y' if on_price else 'y3'
+            ))
+    
     # Add volume bar chart
     fig.add_trace(go.Bar(
         x=hist.index,
@@ -563,6 +928,10 @@ with tab1:
         xaxis_rangeslider_visible=False,
         yaxis=dict(title='Price (PKR)'),
         yaxis2=dict(title='Volume', overlaying='y', side='right', showgrid=False),
+        yaxis3=dict(overlaying='y', side='left', showgrid=False, showticklabels=False, visible=uses_y3),
+        xaxis2=dict(overlaying='x', side='top', range=[profile_max * 4, 0], showgrid=False,
+                    showticklabels=False, visible=False),
+        bargap=0.05 if show_profile else None,
         hovermode='x unified',
         transition={'duration': 500},
         # Better x-axis formatting for different timeframes
@@ -572,6 +941,54 @@ with tab1:
         )
     )
     st.plotly_chart(fig, use_container_width=True, key="main_chart")
+    
+    # Relative performance: every symbol rebased to 100 at the start of the window
+    compare_options = list(dict.fromkeys(st.session_state.watchlist + list(equity_holdings)))
+    compare = st.multiselect(
+        "COMPARE WITH",
+        options=[s for s in compare_options if s != ticker],
+        max_selections=MAX_COMPARE_SYMBOLS,
+        accept_new_options=True,
+        placeholder="Add symbols to compare, e.g. ETH-USD, AAPL",
+        key="compare_symbols"
+    )
+    if compare:
+        compare_symbols = tuple(dict.fromkeys(s.strip().upper() for s in compare if s.strip()))
+        if data_interval:
+            compare_bars = get_batch_bars(compare_symbols, period=data_period, interval=data_interval)
+        else:
+            compare_bars = get_history_bars(compare_symbols, period=data_period, interval="1d")
+        compare_bars = {ticker: hist, **{s: df for s, df in compare_bars.items() if s != ticker}}
+        aligned = align_closes(compare_bars, daily=not data_interval)
+        relative = rebase(aligned.loc[aligned[ticker].first_valid_index():])
+        
+        fig_cmp = go.Figure()
+        for sym in relative.columns:
+            fig_cmp.add_trace(go.Scatter(
+                x=relative.index, y=relative[sym], mode='lines', name=sym,
+                line=dict(width=3 if sym == ticker else 1.5)
+            ))
+        fig_cmp.add_hline(y=100, line=dict(color='#888888', width=1, dash='dot'))
+        fig_cmp.update_layout(
+            template="plotly_dark",
+            paper_bgcolor="#161B22",
+            plot_bgcolor="#161B22",
+            height=400,
+            margin=dict(l=0, r=0, t=30, b=0),
+            yaxis=dict(title='Rebased (start = 100)'),
+            hovermode='x unified',
+            legend=dict(orientation='h', yanchor='bottom', y=1.02, x=0)
+        )
+        st.plotly_chart(fig_cmp, use_container_width=True, key="compare_chart")
+        missing = [s for s in compare_symbols if s not in relative.columns]
+        if missing:
+            st.caption(f"⚠️ No data for {', '.join(missing)}")
+
+# Daily bars from the archive - volatility cone, ATR sizing
+try:
+    daily_hist = load_archived_history(ticker, "5y")
+except Exception:
+    daily_hist = hist.iloc[0:0]
 
 # --- TAB 2: TRADING CONSOLE ---
 with tab2:
@@ -582,7 +999,28 @@ with tab2:
         st.subheader("Place Order")
         
         trade_type = st.selectbox("Order Type", ["MARKET BUY", "MARKET SELL", "LIMIT BUY", "LIMIT SELL"])
-        qty = st.number_input("Quantity", min_value=1, value=10, step=1)
+        whole_units = trades_whole_units(ticker)
+        if whole_units:
+            qty = st.number_input("Quantity", min_value=1, step=1, key="order_qty")
+        else:
+            qty = st.number_input("Quantity", min_value=0.00000001, step=0.01, format="%.8f", key="order_qty_fraction")
+        
+        # ATR position sizing: quantity whose stop-out loses about the chosen risk
+        with st.expander("📏 Position Sizing (ATR)"):
+            daily_atr = atr(daily_hist).iloc[-1] if len(daily_hist) > 14 else float("nan")
+            size_a, size_b = st.columns(2)
+            risk_pkr = size_a.number_input("Risk (PKR)", min_value=1.0, value=max(1.0, round(total_net_worth * 0.01, 2)), step=50.0, key="size_risk")
+            atr_multiple = size_b.number_input("Stop (× ATR)", min_value=0.5, max_value=10.0, value=2.0, step=0.5, key="size_multiple")
+            if np.isnan(daily_atr):
+                st.caption("Not enough daily history for ATR(14)")
+            else:
+                suggested = position_size(risk_pkr, daily_atr, atr_multiple,
+                                          price=curr_price, cash=account.balance if "BUY" in trade_type else None,
+                                          whole=whole_units)
+                st.caption(f"ATR(14, daily): PKR {daily_atr:,.2f} • stop {atr_multiple:g}×ATR = PKR {atr_multiple * daily_atr:,.2f} away")
+                st.markdown(f"**Suggested Quantity:** {suggested:,}" if whole_units else f"**Suggested Quantity:** {suggested:.8f}")
+                st.button("Use suggested quantity", on_click=use_suggested_qty, args=(suggested, whole_units),
+                          disabled=suggested < 1 if whole_units else suggested <= 0, use_container_width=True, key="size_apply")
         
         # Limit order price
         if "LIMIT" in trade_type:
@@ -590,77 +1028,133 @@ with tab2:
         else:
             limit_price = curr_price
         
-        est_total = qty * limit_price
-        st.markdown(f"**Est. Total:** PKR {est_total:,.2f}")
+        # Market orders are priced off the latest bar: spread, size-driven slippage, volume cap
+        realistic_fills = st.checkbox("🎯 Realistic fills", value=True, help="Spread, slippage and partial fills from the latest OHLCV bar")
+        last_bar = hist.iloc[-1]
+        if realistic_fills and "MARKET" in trade_type:
+            est_price, est_qty = engine.fill_model.fill_bar(trade_type.split()[1], qty, last_bar,
+                                                            whole=whole_units)
+            est_total = est_qty * est_price
+            st.markdown(f"**Est. Total:** PKR {est_total:,.2f}")
+            slippage_bps = abs(est_price / curr_price - 1) * 1e4 if curr_price else 0
+            st.caption(f"🎯 Est. fill {est_qty:,g} of {qty} @ PKR {est_price:,.2f} ({slippage_bps:.1f} bps from last)")
+        else:
+            est_total = qty * limit_price
+            st.markdown(f"**Est. Total:** PKR {est_total:,.2f}")
         
         # Show available balance/position
+        if account.margin:
+            st.caption(f"⚖️ Buying Power: PKR {account.margin_status()['buying_power']:,.2f} ({account.leverage:g}x)")
         if "BUY" in trade_type:
-            st.caption(f"💰 Available Cash: PKR {st.session_state.balance:,.2f}")
+            st.caption(f"💰 Available Cash: PKR {account.balance:,.2f}")
         else:
-            current_position = st.session_state.holdings.get(ticker, 0)
-            st.caption(f"📦 Current Position: {current_position} units")
+            current_position = account.holdings.get(ticker, 0)
+            st.caption(f"📦 Current Position: {current_position} units{' (short)' if current_position < 0 else ''}")
         
         if st.button("SUBMIT ORDER", type="primary", use_container_width=True):
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            
-            if "BUY" in trade_type:
-                if st.session_state.balance >= est_total:
-                    st.session_state.balance -= est_total
-                    st.session_state.holdings[ticker] = st.session_state.holdings.get(ticker, 0) + qty
-                    st.session_state.log.append(f"🟢 {timestamp} | BUY {qty} {ticker} @ PKR {limit_price:.2f}")
-                    st.success("✅ ORDER EXECUTED")
-                    time.sleep(0.3)
-                    st.rerun()
-                else:
-                    st.error("❌ INSUFFICIENT FUNDS")
-            else:  # SELL
-                if st.session_state.holdings.get(ticker, 0) >= qty:
-                    st.session_state.balance += est_total
-                    st.session_state.holdings[ticker] -= qty
-                    if st.session_state.holdings[ticker] == 0:
-                        del st.session_state.holdings[ticker]
-                    st.session_state.log.append(f"🔴 {timestamp} | SELL {qty} {ticker} @ PKR {limit_price:.2f}")
-                    st.success("✅ ORDER EXECUTED")
-                    time.sleep(0.3)
-                    st.rerun()
-                else:
-                    st.error("❌ INSUFFICIENT POSITION")
+            order_type, side = trade_type.split()
+            order = engine.submit_order(
+                st.session_state.username, ticker, side, qty, order_type,
+                limit_price=limit_price if order_type == "LIMIT" else None, price=curr_price,
+                bar=last_bar if realistic_fills else None
+            )
+            if order.status in ("FILLED", "PARTIAL"):
+                st.success("✅ ORDER EXECUTED" if order.status == "FILLED" else f"✅ PARTIAL FILL: {order.filled_qty} of {order.qty}")
+                time.sleep(0.3)
+                st.rerun()
+            elif order.status == "OPEN":
+                st.info(f"📋 ORDER #{order.id} RESTING @ PKR {limit_price:,.2f}")
+            else:
+                st.error(f"❌ {order.reason}")
         
         st.markdown('</div>', unsafe_allow_html=True)
 
     with col_trade_R:
         st.markdown('<div class="css-card">', unsafe_allow_html=True)
         st.subheader("Recent Activity")
-        if st.session_state.log:
-            for line in reversed(st.session_state.log[-8:]):
+        if account.log:
+            for line in reversed(account.log[-8:]):
                 st.code(line, language="bash")
         else:
             st.caption("No trades executed this session.")
         
+        open_orders = engine.list_orders(st.session_state.username, status="OPEN")
+        if open_orders:
+            st.markdown("---")
+            st.subheader("Open Orders")
+            for order in open_orders:
+                col_order, col_cancel = st.columns([4, 1])
+                with col_order:
+                    st.code(f"#{order.id} | {order.side} {order.qty} {order.symbol} LIMIT @ PKR {order.limit_price:.2f}", language="bash")
+                with col_cancel:
+                    if st.button("✖", key=f"cancel_{order.id}", use_container_width=True):
+                        engine.cancel_order(order.id)
+                        st.rerun()
+        
         st.markdown("---")
         st.subheader("Current Positions")
-        if st.session_state.holdings:
-            position_data = []
-            for symbol, qty in st.session_state.holdings.items():
-                if qty > 0:
-                    price = get_current_price(symbol)
-                    value = qty * price
-                    position_data.append({
-                        "Asset": symbol,
-                        "Quantity": qty,
-                        "Current Price": f"PKR {price:,.2f}",
-                        "Total Value": f"PKR {value:,.2f}"
-                    })
-            
-            if position_data:
-                df = pd.DataFrame(position_data)
-                st.dataframe(df, use_container_width=True, hide_index=True)
-            else:
-                st.info("Portfolio is empty.")
+        if account.holdings:
+            df = account.positions(ticker_prices)
+            st.dataframe(
+                df,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "Avg Cost": st.column_config.NumberColumn("Avg Cost", format="PKR %.2f"),
+                    "Current Price": st.column_config.NumberColumn("Current Price", format="PKR %.2f"),
+                    "Total Value": st.column_config.NumberColumn("Total Value", format="PKR %.2f"),
+                    "Unrealized P&L": st.column_config.NumberColumn("Unrealized P&L", format="PKR %+.2f"),
+                    "P&L %": st.column_config.NumberColumn("P&L %", format="%+.2f%%")
+                }
+            )
+            col_unreal, col_real = st.columns(2)
+            col_unreal.metric("Unrealized P&L", f"PKR {df['Unrealized P&L'].sum():+,.2f}")
+            col_real.metric("Realized P&L", f"PKR {account.realized_pnl:+,.2f}")
         else:
             st.info("Portfolio is empty.")
         st.markdown('</div>', unsafe_allow_html=True)
 
+    # Basket orders - one quote snapshot, one validation, one ledger write
+    st.markdown('<div class="css-card">', unsafe_allow_html=True)
+    st.subheader("🧺 Basket Order")
+    basket = st.data_editor(
+        st.session_state.basket_orders,
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Symbol": st.column_config.TextColumn("Symbol", required=True),
+            "Side": st.column_config.SelectboxColumn("Side", options=["BUY", "SELL"], default="BUY", required=True),
+            "Quantity": st.column_config.NumberColumn("Quantity", min_value=0.00000001, format="%.8g", default=1, required=True),
+            "Type": st.column_config.SelectboxColumn("Type", options=["MARKET", "LIMIT"], default="MARKET", required=True),
+            "Limit Price": st.column_config.NumberColumn("Limit Price (PKR)", min_value=0.0, format="%.2f")
+        },
+        key=f"basket_editor_{st.session_state.basket_version}"
+    )
+    
+    col_basket_go, col_basket_clear = st.columns([3, 1])
+    with col_basket_go:
+        if st.button("SUBMIT BASKET", type="primary", use_container_width=True, disabled=basket.empty):
+            basket_symbols = sorted(set(basket["Symbol"].dropna().astype(str).str.strip().str.upper()))
+            basket_bars = get_batch_bars(tuple(basket_symbols))
+            basket_quotes = {s: float(basket_bars[s]['Close'].iloc[-1]) if s in basket_bars else 0.0 for s in basket_symbols}
+            try:
+                engine.submit_basket(
+                    st.session_state.username, basket, basket_quotes,
+                    bars={s: df.iloc[-1] for s, df in basket_bars.items()} if realistic_fills else None
+                )
+                st.session_state.basket_orders = st.session_state.basket_orders.iloc[0:0]
+                st.session_state.basket_version += 1
+                st.rerun()
+            except OrderError as e:
+                st.error(f"❌ {e}")
+    with col_basket_clear:
+        if st.button("Clear", use_container_width=True, key="basket_clear"):
+            st.session_state.basket_orders = st.session_state.basket_orders.iloc[0:0]
+            st.session_state.basket_version += 1
+            st.rerun()
+    st.markdown('</div>', unsafe_allow_html=True)
+
 # --- TAB 3: INTELLIGENCE ---
 with tab3:
     col_vid, col_news = st.columns(2)
@@ -688,22 +1182,68 @@ with tab3:
     with col_news:
         st.markdown('<div class="css-card">', unsafe_allow_html=True)
         st.subheader("📰 Live Wire")
-        try:
-            rss_url = f"https://finance.yahoo.com/rss/headline?s={ticker}"
-            feed = feedparser.parse(rss_url)
-            if feed.entries:
-                for entry in feed.entries[:6]:
-                    st.markdown(f"""
-                    <div style="margin-bottom: 10px; border-bottom: 1px solid #30363D; padding-bottom: 5px;">
-                        <a href="{entry.link}" target="_blank" style="text-decoration: none; color: #58A6FF; font-weight: bold;">{entry.title}</a>
-                        <div style="font-size: 12px; color: #8B949E;">{entry.published if 'published' in entry else 'Recent'}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-            else:
-                st.info("No recent news available.")
-        except Exception as e:
+        if headlines is None:
             st.warning("News feed temporarily offline.")
+        elif headlines:
+            for entry in headlines[:6]:
+                score = sentiment_cache.score(entry) or 0.0
+                tone = "#00FF00" if score >= 0.05 else "#FF0000" if score <= -0.05 else "#8B949E"
+                st.markdown(f"""
+                <div style="margin-bottom: 10px; border-bottom: 1px solid #30363D; padding-bottom: 5px;">
+                    <a href="{entry['link']}" target="_blank" style="text-decoration: none; color: #58A6FF; font-weight: bold;">{entry['title']}</a>
+                    <div style="font-size: 12px; color: #8B949E;">{entry['published'] or 'Recent'} • <span style="color: {tone};">sentiment {score:+.2f}</span></div>
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.info("No recent news available.")
         st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Per-headline scores over time with a recency-weighted trend
+    news_history = sentiment_cache.history(ticker)
+    if not news_history.empty:
+        st.markdown('<div class="css-card">', unsafe_allow_html=True)
+        st.subheader("🗞️ News Sentiment")
+        trend = news_history["Score"].ewm(halflife=pd.Timedelta(hours=24), times=news_history.index).mean()
+        fig_news = go.Figure()
+        fig_news.add_trace(go.Scatter(
+            x=news_history.index, y=news_history["Score"], mode='markers', name='Headline',
+            text=news_history["Title"], hovertemplate='%{text}<br>%{y:+.2f}<extra></extra>',
+            marker=dict(size=9, color=news_history["Score"], colorscale=[[0, "#FF0000"], [0.5, "#8B949E"], [1, "#00FF00"]], cmin=-1, cmax=1)
+        ))
+        fig_news.add_trace(go.Scatter(x=trend.index, y=trend, mode='lines', name='Trend (24h half-life)', line=dict(color='#58A6FF', width=2)))
+        fig_news.add_hline(y=0, line_dash="dot", line_color="#30363D")
+        fig_news.update_layout(
+            template="plotly_dark", height=300, paper_bgcolor="#161B22", plot_bgcolor="#161B22",
+            margin=dict(l=0, r=0, t=10, b=0), yaxis=dict(range=[-1.05, 1.05], title="Sentiment"),
+            legend=dict(orientation="h", y=1.1)
+        )
+        st.plotly_chart(fig_news, use_container_width=True)
+        st.caption(f"{len(news_history)} headlines scored for {ticker} • aggregate {news_score:+.2f} ({sentiment_label(news_score)})")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    # Search everything any session has fetched, across all symbols
+    st.markdown('<div class="css-card">', unsafe_allow_html=True)
+    st.subheader("🗄️ News Archive")
+    news_archive = get_news_archive()
+    col_query, col_scope = st.columns([3, 1])
+    news_query = col_query.text_input("SEARCH HEADLINES", placeholder="earnings guidance $AAPL", key="news_query")
+    news_scope = col_scope.radio("SCOPE", ["All symbols", ticker], horizontal=True, key="news_scope")
+    started = time.perf_counter()
+    found = news_archive.search(news_query, symbol=None if news_scope == "All symbols" else ticker, limit=50)
+    elapsed = (time.perf_counter() - started) * 1000
+    st.caption(f"{found.attrs['matches']:,} matches in {elapsed:.1f} ms • {len(news_archive):,} stories archived • "
+               f"{news_archive.duplicates:,} syndicated copies collapsed • use $TICKER to filter by symbol")
+    if found.empty:
+        st.info("No archived headlines match.")
+    else:
+        st.dataframe(
+            found, use_container_width=True, hide_index=True,
+            column_config={
+                "Published": st.column_config.DatetimeColumn("Published", format="YYYY-MM-DD HH:mm"),
+                "Link": st.column_config.LinkColumn("Link", display_text="open")
+            }
+        )
+    st.markdown('</div>', unsafe_allow_html=True)
 
 # --- TAB 4: ANALYTICS ---
 with tab4:
@@ -748,22 +1288,38 @@ with tab4:
         
         # Calculate returns
         period_return = ((curr_price - hist['Close'].iloc[0]) / hist['Close'].iloc[0]) * 100
-        volatility = hist['Close'].pct_change().std() * 100
+        cone = vol_cone(daily_hist['Close'], periods_per_year=periods_per_year(ticker)) if not daily_hist.empty else pd.DataFrame()
         
         st.metric("Period Return", f"{period_return:+.2f}%")
-        st.metric("Volatility", f"{volatility:.2f}%")
+        st.metric("Volatility (20d, annualized)", f"{cone.loc[20, 'Current']:.2f}%" if 20 in cone.index else "N/A")
         st.metric("Total Volume", f"{hist['Volume'].sum()/1e9:.2f}B")
         
         # Portfolio Performance
-        if st.session_state.holdings:
+        if account.holdings:
             st.markdown("---")
             st.markdown("**Portfolio Performance**")
             initial_value = 25000.0
-            current_value = st.session_state.balance + holdings_val
+            current_value = account.balance + holdings_val
             portfolio_return = ((current_value - initial_value) / initial_value) * 100
             
             st.metric("Portfolio Return", f"{portfolio_return:+.2f}%")
-            st.metric("Total Trades", len(st.session_state.log))
+            st.metric("Total Trades", len(account.log))
+        
+        # Closed-trade statistics (running accumulators, updated per fill)
+        stats = account.stats
+        if stats.count:
+            st.markdown("---")
+            st.markdown(f"**Trade Statistics** ({stats.count} closed)")
+            s1, s2, s3 = st.columns(3)
+            s1.metric("Win Rate", f"{stats.win_rate:.1f}%")
+            s2.metric("Profit Factor", "∞" if np.isinf(stats.profit_factor) else f"{stats.profit_factor:.2f}")
+            s3.metric("Expectancy", f"PKR {stats.expectancy:+,.2f}")
+            s1.metric("Avg Win", f"PKR {stats.avg_win:,.2f}")
+            s2.metric("Avg Loss", f"PKR {stats.avg_loss:,.2f}")
+            s3.metric("Avg Holding", f"{stats.mean_hold / 3600:.1f} h" if stats.mean_hold >= 3600 else f"{stats.mean_hold / 60:.1f} min")
+            s1.metric("Sharpe (per trade)", "N/A" if np.isnan(stats.sharpe) else f"{stats.sharpe:.2f}")
+            s2.metric("Sortino (per trade)", "N/A" if np.isnan(stats.sortino) else f"{stats.sortino:.2f}")
+            s3.metric("Realized Max DD", f"PKR {from_minor(stats.max_drawdown):,.2f}")
         
         st.markdown('</div>', unsafe_allow_html=True)
     
@@ -771,14 +1327,27 @@ with tab4:
     st.markdown('<div class="css-card">', unsafe_allow_html=True)
     st.subheader("📉 Price Distribution")
     
+    dist_a, dist_b = st.columns([3, 1])
+    dist_view = dist_a.radio("VIEW", ["Price", "Returns"], horizontal=True, key="dist_view")
+    show_kde = dist_b.checkbox("KDE", value=False, key="dist_kde")
+    dist_stamp = (str(hist.index[-1]), len(hist), float(hist['Close'].iloc[-1]))
+    dist = get_distribution(ticker, period, dist_stamp, hist['Close'])[dist_view]
+    
     fig_dist = go.Figure()
-    fig_dist.add_trace(go.Histogram(
-        x=hist['Close'],
-        nbinsx=30,
-        marker_color='#00FF00',
-        opacity=0.7,
-        name='Price Distribution'
-    ))
+    if dist is not None:
+        fig_dist.add_trace(go.Bar(
+            x=dist['centers'],
+            y=dist['counts'],
+            width=dist['width'],
+            marker_color='#00FF00',
+            opacity=0.7,
+            name='Price Distribution' if dist_view == "Price" else 'Return Distribution'
+        ))
+        if show_kde:
+            fig_dist.add_trace(go.Scatter(
+                x=dist['kde_x'], y=dist['kde_y'], mode='lines',
+                line=dict(color='#FFD700', width=2), name='KDE'
+            ))
     
     fig_dist.update_layout(
         template="plotly_dark",
@@ -787,13 +1356,456 @@ with tab4:
         height=300,
         margin=dict(l=0, r=0, t=10, b=0),
         showlegend=False,
-        xaxis_title="Price (PKR)",
+        xaxis_title="Price (PKR)" if dist_view == "Price" else "Bar Return (%)",
         yaxis_title="Frequency",
+        bargap=0.05,
         transition={'duration': 500}
     )
     
     st.plotly_chart(fig_dist, use_container_width=True, key="dist_chart")
     st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Volatility cone: where today's realized vol sits in its own history, per window
+    st.markdown('<div class="css-card">', unsafe_allow_html=True)
+    st.subheader("🌡️ Volatility Cone")
+    if cone.empty:
+        st.info("Not enough daily history for a volatility cone")
+    else:
+        fig_cone = go.Figure()
+        cone_x = [f"{w}d" for w in cone.index]
+        for col_name, dash, width in (("P100", "dot", 1), ("P75", "dash", 1), ("P50", "solid", 1.5), ("P25", "dash", 1), ("P0", "dot", 1)):
+            fig_cone.add_trace(go.Scatter(
+                x=cone_x, y=cone[col_name], mode='lines', name={"P100": "Max", "P0": "Min", "P50": "Median"}.get(col_name, col_name),
+                line=dict(color='#58A6FF', dash=dash, width=width)
+            ))
+        fig_cone.add_trace(go.Scatter(
+            x=cone_x, y=cone['Current'], mode='lines+markers', name='Current',
+            line=dict(color='#00FF00', width=2), marker=dict(size=9)
+        ))
+        fig_cone.update_layout(
+            template="plotly_dark",
+            paper_bgcolor="#161B22",
+            plot_bgcolor="#161B22",
+            height=300,
+            margin=dict(l=0, r=0, t=10, b=0),
+            xaxis_title="Window",
+            yaxis_title="Annualized Volatility %",
+            hovermode="x unified"
+        )
+        st.plotly_chart(fig_cone, use_container_width=True, key="vol_cone_chart")
+        st.caption(f"{len(daily_hist)} daily bars • windows {', '.join(map(str, VOL_WINDOWS))} • annualized with {periods_per_year(ticker)} days")
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # When the symbol usually moves: archived 5-minute bars grouped by weekday and hour
+    st.markdown('<div class="css-card">', unsafe_allow_html=True)
+    st.subheader("🕐 Intraday Seasonality")
+    try:
+        intraday = load_archived_history(ticker, "max", "5m")
+    except Exception:
+        intraday = hist.iloc[0:0]
+    season = get_seasonality(ticker)
+    season.update(intraday)
+    col_season_a, col_season_b = st.columns(2)
+    season_view = col_season_a.radio("VIEW", ["Hour of day", "Day of week", "Heatmap"], horizontal=True, key="season_view")
+    season_metric = col_season_b.radio("METRIC", ["Avg Return %", "Volatility %", "Avg Volume"], horizontal=True, key="season_metric")
+    if season.bars == 0:
+        st.info("No intraday history archived for this symbol yet")
+    else:
+        if season_view == "Heatmap":
+            grid = season.heatmap(season_metric)
+            fig_season = go.Figure(go.Heatmap(
+                z=grid.to_numpy(), x=list(grid.columns), y=list(grid.index),
+                colorscale='RdYlGn' if season_metric == "Avg Return %" else 'Blues',
+                zmid=0 if season_metric == "Avg Return %" else None,
+                hovertemplate='%{y} %{x}:00<br>%{z:.4f}<extra></extra>'
+            ))
+            fig_season.update_layout(yaxis=dict(autorange='reversed'), xaxis_title="Hour (exchange time)")
+        else:
+            stats = season.profile("hour" if season_view == "Hour of day" else "weekday")
+            values = stats[season_metric]
+            bar_colors = np.where(values >= 0, '#00FF00', '#FF0000') if season_metric == "Avg Return %" else '#58A6FF'
+            fig_season = go.Figure(go.Bar(
+                x=stats.index, y=values, marker_color=bar_colors, customdata=stats['Bars'],
+                hovertemplate='%{x}<br>%{y:.4f}<br>%{customdata} bars<extra></extra>'
+            ))
+            fig_season.update_layout(yaxis_title=season_metric, xaxis_title="Hour (exchange time)" if season_view == "Hour of day" else None)
+        fig_season.update_layout(
+            template="plotly_dark",
+            paper_bgcolor="#161B22",
+            plot_bgcolor="#161B22",
+            height=320,
+            margin=dict(l=0, r=0, t=10, b=0)
+        )
+        st.plotly_chart(fig_season, use_container_width=True, key="season_chart")
+        st.caption(f"{season.bars:,} archived 5-minute bars since {intraday.index[0]:%Y-%m-%d} • returns are per bar, "
+                   f"excluding overnight and weekend gaps")
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Equity curve rebuilt from the trade journal
+    st.markdown('<div class="css-card">', unsafe_allow_html=True)
+    st.subheader("📈 Equity Curve")
+    journal = list(account.journal)
+    traded = tuple(sorted({row[1] for row in journal if row[1] is not None}))
+    if traded:
+        equity = st.session_state.equity_curve.update(journal, align_closes(get_batch_bars(traded, period="5d", interval="5m")))
+    else:
+        equity = pd.DataFrame()
+    if equity.empty:
+        st.info("Place a trade to start your equity curve")
+    else:
+        fig_eq = go.Figure()
+        fig_eq.add_trace(go.Scatter(
+            x=equity.index, y=equity['Drawdown'], fill='tozeroy', mode='lines',
+            line=dict(color='#FF4B4B', width=0), fillcolor='rgba(255, 75, 75, 0.25)',
+            name='Drawdown %', yaxis='y2'
+        ))
+        fig_eq.add_trace(go.Scatter(
+            x=equity.index, y=equity['NAV'], mode='lines',
+            line=dict(color='#00FF00', width=2), name='NAV'
+        ))
+        fig_eq.update_layout(
+            template="plotly_dark",
+            paper_bgcolor="#161B22",
+            plot_bgcolor="#161B22",
+            height=320,
+            margin=dict(l=0, r=0, t=10, b=0),
+            showlegend=False,
+            yaxis=dict(title="NAV (PKR)"),
+            yaxis2=dict(title="Drawdown %", overlaying='y', side='right', showgrid=False),
+            hovermode="x unified"
+        )
+        st.plotly_chart(fig_eq, use_container_width=True, key="equity_chart")
+        eq_a, eq_b = st.columns(2)
+        eq_a.metric("NAV", f"PKR {equity['NAV'].iloc[-1]:,.2f}")
+        eq_b.metric("Max Drawdown", f"{equity['Drawdown'].min():.2f}%")
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Correlation / covariance across holdings and watchlist
+    st.markdown('<div class="css-card">', unsafe_allow_html=True)
+    st.subheader("🔗 Correlation Matrix")
+    corr_symbols = tuple(sorted(set(equity_holdings) | set(st.session_state.watchlist)))
+    corr_a, corr_b = st.columns(2)
+    corr_window = corr_a.select_slider("WINDOW (DAILY BARS)", options=[20, 60, 120, 250], value=60, key="corr_window")
+    corr_view = corr_b.radio("SHOW", ["Correlation", "Covariance"], horizontal=True, key="corr_view")
+    if len(corr_symbols) < 2:
+        st.info("Add at least two symbols to your watchlist or holdings")
+    else:
+        corr_closes = align_closes(get_history_bars(corr_symbols, period="1y", interval="1d"))
+        cov_df, corr_df = st.session_state.correlation_matrix.compute(corr_closes, corr_window)
+        matrix = corr_df if corr_view == "Correlation" else cov_df
+        fig_corr = go.Figure(go.Heatmap(
+            z=matrix.to_numpy(),
+            x=list(matrix.columns),
+            y=list(matrix.index),
+            colorscale='RdBu',
+            zmid=0,
+            zmin=-1 if corr_view == "Correlation" else None,
+            zmax=1 if corr_view == "Correlation" else None,
+            text=matrix.to_numpy(),
+            texttemplate="%{text:.2f}" if corr_view == "Correlation" else "%{text:.2e}"
+        ))
+        fig_corr.update_layout(
+            template="plotly_dark",
+            paper_bgcolor="#161B22",
+            plot_bgcolor="#161B22",
+            height=max(300, 40 * len(matrix)),
+            margin=dict(l=0, r=0, t=10, b=0),
+            yaxis=dict(autorange='reversed')
+        )
+        st.plotly_chart(fig_corr, use_container_width=True, key="corr_chart")
+        st.caption(f"Log returns over the last {corr_window} daily bars • {len(matrix)} symbols")
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Mean-variance optimizer -> basket order list
+    st.markdown('<div class="css-card">', unsafe_allow_html=True)
+    st.subheader("🧮 Portfolio Optimizer")
+    opt_symbols = st.multiselect("CANDIDATES", options=list(corr_symbols), default=list(corr_symbols), key="opt_symbols")
+    opt_a, opt_b = st.columns(2)
+    opt_cap = opt_a.slider("MAX WEIGHT PER ASSET", min_value=10, max_value=100, value=40, step=5, format="%d%%", key="opt_cap") / 100
+    opt_target = opt_b.radio("TARGET", ["Max Sharpe", "Min Variance"], horizontal=True, key="opt_target")
+    if len(opt_symbols) < 2:
+        st.info("Pick at least two candidates")
+    elif opt_cap * len(opt_symbols) < 1:
+        st.warning(f"⚠️ A {opt_cap:.0%} cap needs at least {-(-100 // int(opt_cap * 100))} candidates")
+    else:
+        opt_closes = align_closes(get_history_bars(tuple(sorted(opt_symbols)), period="1y", interval="1d"))
+        opt_cov, _ = st.session_state.correlation_matrix.compute(opt_closes, corr_window)
+        result = run_optimizer(opt_closes, opt_cap, corr_window, opt_cov)
+        frontier = result["frontier"]
+        target = result["max_sharpe"] if opt_target == "Max Sharpe" else result["min_variance"]
+        picks = {"Min Variance": 0, "Max Sharpe": int(frontier["Sharpe"].fillna(-float("inf")).idxmax())}
+        
+        fig_front = go.Figure()
+        fig_front.add_trace(go.Scatter(
+            x=frontier['Volatility'], y=frontier['Return'], mode='lines+markers',
+            line=dict(color='#00FF00', width=2), marker=dict(size=4), name='Frontier'
+        ))
+        for label, i in picks.items():
+            fig_front.add_trace(go.Scatter(
+                x=[frontier['Volatility'][i]], y=[frontier['Return'][i]], mode='markers+text',
+                marker=dict(size=12, color='#FFD700' if label == opt_target else '#888888'),
+                text=[label], textposition='top center', name=label
+            ))
+        fig_front.update_layout(
+            template="plotly_dark",
+            paper_bgcolor="#161B22",
+            plot_bgcolor="#161B22",
+            height=320,
+            margin=dict(l=0, r=0, t=10, b=0),
+            showlegend=False,
+            xaxis_title="Volatility (annualized %)",
+            yaxis_title="Expected Return (annualized %)"
+        )
+        st.plotly_chart(fig_front, use_container_width=True, key="frontier_chart")
+        
+        opt_quotes = get_batch_quotes(tuple(sorted(set(opt_symbols) | set(equity_holdings))))
+        equity_val = calculate_portfolio_value(account, {sym: ticker_prices[sym] for sym in equity_holdings})
+        rebalance = rebalance_orders(target, opt_quotes, equity_holdings, account.balance + equity_val)
+        weights_col, orders_col = st.columns(2)
+        with weights_col:
+            st.markdown(f"**{opt_target} weights**")
+            st.dataframe(
+                (target[target > 1e-4] * 100).sort_values(ascending=False).rename("Weight %").to_frame(),
+                use_container_width=True,
+                column_config={"Weight %": st.column_config.ProgressColumn("Weight %", format="%.1f%%", min_value=0, max_value=100)}
+            )
+        with orders_col:
+            st.markdown("**Rebalance orders**")
+            if rebalance.empty:
+                st.caption("Already on target")
+            else:
+                st.dataframe(rebalance[["Symbol", "Side", "Quantity"]], use_container_width=True, hide_index=True)
+                if st.button("📋 LOAD INTO BASKET", use_container_width=True, key="opt_to_basket"):
+                    st.session_state.basket_orders = rebalance
+                    st.session_state.basket_version += 1
+                    st.rerun()
+        st.caption(f"Long-only, max {opt_cap:.0%} per asset • {corr_window}-bar daily returns • whole shares, fractional crypto / FX at current quotes")
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Monte Carlo outlook for the current holdings
+    st.markdown('<div class="css-card">', unsafe_allow_html=True)
+    st.subheader("🎲 Monte Carlo Outlook")
+    held = {sym: qty for sym, qty in equity_holdings.items() if qty}
+    if not held:
+        st.info("Hold at least one asset to simulate outcomes")
+    else:
+        mc_a, mc_b, mc_c = st.columns(3)
+        mc_horizon = mc_a.slider("HORIZON (DAYS)", min_value=5, max_value=120, value=30, step=5, key="mc_horizon")
+        mc_paths = mc_b.select_slider("PATHS", options=[10000, 20000, 50000, 100000], value=20000, key="mc_paths")
+        mc_method = mc_c.radio("MODEL", ["Bootstrap", "Multivariate normal"], horizontal=True, key="mc_method")
+        if st.button("RUN SIMULATION", type="primary", use_container_width=True, key="mc_run"):
+            mc_symbols = tuple(sorted(held))
+            mc_closes = align_closes(get_history_bars(mc_symbols, period="1y", interval="1d")).reindex(columns=list(mc_symbols))
+            mc_returns = np.diff(np.log(mc_closes.to_numpy(dtype=float)[-251:]), axis=0)
+            mc_values = [held[sym] * ticker_prices.get(sym, 0.0) for sym in mc_symbols]
+            with st.spinner(f"Simulating {mc_paths:,} paths..."):
+                try:
+                    st.session_state.mc_result = simulate(
+                        mc_returns, mc_values, cash=account.balance, horizon=mc_horizon, paths=mc_paths,
+                        method="bootstrap" if mc_method == "Bootstrap" else "normal",
+                        executor=get_simulation_pool()
+                    )
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+        
+        mc = st.session_state.get('mc_result')
+        if mc is not None:
+            bands = mc['bands']
+            fig_mc = go.Figure()
+            for low, high, alpha in (("P5", "P95", 0.15), ("P25", "P75", 0.3)):
+                fig_mc.add_trace(go.Scatter(x=bands.index, y=bands[high], mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+                fig_mc.add_trace(go.Scatter(
+                    x=bands.index, y=bands[low], mode='lines', line=dict(width=0), fill='tonexty',
+                    fillcolor=f'rgba(0, 255, 0, {alpha})', name=f"{low}-{high}"
+                ))
+            fig_mc.add_trace(go.Scatter(x=bands.index, y=bands['P50'], mode='lines', line=dict(color='#00FF00', width=2), name='Median'))
+            fig_mc.update_layout(
+                template="plotly_dark",
+                paper_bgcolor="#161B22",
+                plot_bgcolor="#161B22",
+                height=320,
+                margin=dict(l=0, r=0, t=10, b=0),
+                showlegend=False,
+                xaxis_title="Days ahead",
+                yaxis_title="Net Worth (PKR)",
+                hovermode="x unified"
+            )
+            st.plotly_chart(fig_mc, use_container_width=True, key="mc_chart")
+            m1, m2, m3, m4 = st.columns(4)
+            m1.metric("Median Outcome", f"PKR {bands['P50'].iloc[-1]:,.0f}", f"{bands['P50'].iloc[-1] - mc['start']:+,.0f}")
+            m2.metric("Probability of Loss", f"{mc['prob_loss']:.1%}")
+            m3.metric("VaR 95%", f"PKR {mc['var']:,.0f}")
+            m4.metric("Expected Shortfall 95%", f"PKR {mc['expected_shortfall']:,.0f}")
+            st.caption(f"{len(mc['final']):,} paths • {len(bands) - 1} days • bands show the 5-95% and 25-75% ranges")
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Screener: one indicator expression over the whole watchlist
+    st.markdown('<div class="css-card">', unsafe_allow_html=True)
+    st.subheader("🔎 Screener")
+    screen_expr = st.text_input("EXPRESSION (DAILY BARS)", value="close > sma(close, 50) and rsi(close, 14) < 70", key="screen_expr")
+    screen_symbols = tuple(st.session_state.watchlist)
+    if screen_expr.strip() and screen_symbols:
+        screen_bars = get_history_bars(screen_symbols, period="1y", interval="1d")
+        indicators = get_indicator_engine()
+        rows = []
+        try:
+            for sym, df in screen_bars.items():
+                value = indicators.evaluate([screen_expr], df, symbol=sym, interval="1d", window="1y").iloc[-1, 0]
+                rows.append({"Symbol": sym, "Last": float(df['Close'].iloc[-1]), "Signal": value})
+        except IndicatorError as e:
+            st.error(f"❌ {e}")
+            rows = []
+        if rows:
+            screen = pd.DataFrame(rows)
+            if screen["Signal"].dtype == bool:
+                screen = screen.sort_values(["Signal", "Symbol"], ascending=[False, True])
+                st.caption(f"{int(screen['Signal'].sum())} of {len(screen)} watchlist symbols match")
+            else:
+                screen = screen.sort_values("Signal", ascending=False)
+            st.dataframe(
+                screen,
+                use_container_width=True,
+                hide_index=True,
+                column_config={"Last": st.column_config.NumberColumn("Last", format="PKR %.2f")}
+            )
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Candlestick pattern scan over the watchlist and open positions
+    st.markdown('<div class="css-card">', unsafe_allow_html=True)
+    st.subheader("🕯️ Pattern Scan")
+    col_scan_a, col_scan_b = st.columns(2)
+    scan_interval = col_scan_a.radio("BARS", ["1d", "1h"], horizontal=True, key="pattern_interval")
+    scan_within = col_scan_b.number_input("FIRED WITHIN LAST N BARS", min_value=1, max_value=20, value=3, step=1, key="pattern_within")
+    scan_symbols = tuple(dict.fromkeys([ticker] + st.session_state.watchlist + list(equity_holdings)))
+    scan_period = "1y" if scan_interval == "1d" else "1mo"
+    scan_bars = get_history_bars(scan_symbols, period=scan_period, interval=scan_interval)
+    scan = get_pattern_scanner().scan(scan_bars, scan_interval, within=int(scan_within), window=scan_period)
+    st.caption(f"{len(scan)} signals across {len(scan_bars)} symbols • cached per symbol, new bars only re-check the trailing window")
+    if scan.empty:
+        st.info("No patterns in the selected window.")
+    else:
+        st.dataframe(
+            scan.sort_values(["Bar", "Symbol"], ascending=[False, True]),
+            use_container_width=True,
+            hide_index=True,
+            column_config={"Close": st.column_config.NumberColumn("Close", format="PKR %.2f")}
+        )
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Leaderboard across all paper accounts
+    st.markdown('<div class="css-card">', unsafe_allow_html=True)
+    st.subheader("🏆 Leaderboard")
+    leaderboard = get_leaderboard()
+    leaderboard.observe()
+    my_rank = leaderboard.rank(st.session_state.username)
+    st.caption(f"You are #{my_rank} of {len(engine.accounts)} traders • stats sampled at most every {leaderboard.sample_interval:.0f}s")
+    st.dataframe(
+        leaderboard.top(10),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Net Worth": st.column_config.NumberColumn("Net Worth", format="PKR %.2f"),
+            "Return %": st.column_config.NumberColumn("Return %", format="%+.2f%%"),
+            "Sharpe": st.column_config.NumberColumn("Sharpe", format="%.2f"),
+            "Max DD %": st.column_config.NumberColumn("Max DD %", format="%.2f%%")
+        }
+    )
+    st.markdown('</div>', unsafe_allow_html=True)
+
+# --- TAB 5: OPTIONS ---
+with tab5:
+    # Every tab runs on every rerun (the live refresh included), so nothing is fetched until
+    # asked for: expiries behind a button, a chain once an expiry is picked or refreshed
+    if st.session_state.options_symbol != ticker:
+        st.session_state.option_chain = None
+        if st.button(f"LOAD OPTIONS FOR {ticker}", type="primary", key="options_load"):
+            st.session_state.options_symbol = ticker
+            st.rerun()
+        expiries = None
+    else:
+        expiries = get_option_expiries(ticker)
+    if expiries is None:
+        st.caption("Listed expiries and chains are fetched on request")
+    elif not expiries:
+        st.info(f"No listed options for {ticker} - try an equity such as AAPL or TSLA")
+    else:
+        opt_col_a, opt_col_b, opt_col_c, opt_col_d = st.columns([2, 1, 1, 1])
+        expiry = opt_col_a.selectbox("EXPIRY", expiries, index=None, placeholder="Pick an expiry", key="option_expiry")
+        option_side = opt_col_b.radio("SIDE", ["CALL", "PUT"], horizontal=True, key="option_side")
+        risk_free = opt_col_c.number_input("RISK-FREE RATE %", min_value=0.0, max_value=20.0, value=4.5, step=0.25, key="option_rate") / 100
+        refresh_chain = opt_col_d.button("🔄 REFRESH QUOTES", use_container_width=True, disabled=expiry is None, key="option_refresh")
+        chain = None
+        if expiry is not None:
+            loaded = st.session_state.option_chain
+            try:
+                if refresh_chain or loaded is None or loaded[0] != (ticker, expiry):
+                    loaded = st.session_state.option_chain = ((ticker, expiry), *get_option_chain(ticker, expiry))
+                    fresh_chain = True
+                else:
+                    fresh_chain = False
+                _, calls, puts, snapshot = loaded
+                chain = get_chain_analytics(ticker, expiry, snapshot, curr_price, risk_free, calls, puts)
+            except Exception as e:
+                st.error(f"❌ Could not load the {expiry} chain: {e}")
+            if chain is not None and fresh_chain:
+                # Held contracts are marked at the new quotes - they have no bars to value them by
+                marks = chain[chain["Contract"].isin(list(holdings)) & (chain["Mid"] > 0)]
+                for contract, mark in zip(marks["Contract"], marks["Mid"]):
+                    engine.on_price(contract, float(mark))
+        
+        if chain is not None:
+            side_chain = chain[chain["Type"] == option_side].reset_index(drop=True)
+            atm = int((side_chain["Strike"] - curr_price).abs().idxmin()) if not side_chain.empty else 0
+            st.caption(f"Spot PKR {curr_price:,.2f} • {len(chain)} contracts • {years_to_expiry(expiry) * 365.25:.1f} days to expiry • "
+                       f"quotes as of {datetime.fromtimestamp(snapshot).strftime('%H:%M:%S')}")
+            st.dataframe(
+                side_chain.drop(columns=["Type"]),
+                use_container_width=True,
+                hide_index=True,
+                height=420,
+                column_config={
+                    "Strike": st.column_config.NumberColumn("Strike", format="%.2f"),
+                    "Bid": st.column_config.NumberColumn("Bid", format="%.2f"),
+                    "Ask": st.column_config.NumberColumn("Ask", format="%.2f"),
+                    "Mid": st.column_config.NumberColumn("Mid", format="%.2f"),
+                    "IV %": st.column_config.NumberColumn("IV %", format="%.1f"),
+                    "Delta": st.column_config.NumberColumn("Delta", format="%.3f"),
+                    "Gamma": st.column_config.NumberColumn("Gamma", format="%.4f"),
+                    "Theta": st.column_config.NumberColumn("Theta/day", format="%.3f"),
+                    "Vega": st.column_config.NumberColumn("Vega/pt", format="%.3f")
+                }
+            )
+            
+            # Paper-trade contracts through the same ledger (1 contract = 100 units of the contract symbol)
+            st.markdown('<div class="css-card">', unsafe_allow_html=True)
+            st.subheader("Trade Option")
+            if side_chain.empty:
+                st.info("No contracts on this side")
+            else:
+                labels = [f"{row.Strike:,.2f} {option_side} • {row.Contract}" for row in side_chain.itertuples()]
+                trade_a, trade_b, trade_c = st.columns([3, 1, 1])
+                pick = trade_a.selectbox("CONTRACT", range(len(labels)), index=atm, format_func=labels.__getitem__, key="option_contract")
+                contracts = trade_b.number_input("CONTRACTS", min_value=1, value=1, step=1, key="option_contracts")
+                option_action = trade_c.radio("ACTION", ["BUY", "SELL"], horizontal=True, key="option_action")
+                row = side_chain.iloc[pick]
+                quote = row["Ask"] if option_action == "BUY" else row["Bid"]
+                premium = float(quote) if quote > 0 else float(row["Mid"])
+                held_contracts = account.holdings.get(row["Contract"], 0) / CONTRACT_SIZE
+                st.caption(f"Premium PKR {premium:,.2f} × {CONTRACT_SIZE} = PKR {premium * CONTRACT_SIZE * contracts:,.2f} • "
+                           f"Δ {row['Delta']:+.3f} • IV {row['IV %']:.1f}% • holding {held_contracts:g} contracts")
+                if st.button(f"{option_action} {contracts} CONTRACT{'S' if contracts > 1 else ''}", type="primary",
+                             use_container_width=True, disabled=premium <= 0, key="option_submit"):
+                    order = engine.submit_order(
+                        st.session_state.username, row["Contract"], option_action, contracts * CONTRACT_SIZE,
+                        "MARKET", price=premium
+                    )
+                    if order.status == "FILLED":
+                        st.success(f"✅ {option_action} {contracts} × {row['Contract']} @ PKR {premium:,.2f}")
+                        time.sleep(0.3)
+                        st.rerun()
+                    else:
+                        st.error(f"❌ {order.reason}")
+            st.markdown('</div>', unsafe_allow_html=True)
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,223 @@
+"""Vaultex history archive - memory-mapped columnar OHLCV storage on disk"""
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vaultex_data", "archive")
+
+# One flat binary file per column, timestamps are int64 UTC nanoseconds
+TS_COLUMN = "ts"
+COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+DTYPES = {TS_COLUMN: np.int64, "Open": np.float64, "High": np.float64,
+          "Low": np.float64, "Close": np.float64, "Volume": np.float64}
+
+# How far back a period query reaches (None = everything in the archive)
+PERIOD_OFFSETS = {
+    "1d": pd.DateOffset(days=1),
+    "5d": pd.DateOffset(days=5),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+    "ytd": None,
+    "max": None,
+}
+
+# First download per interval - Yahoo caps how far back intraday bars go
+BACKFILL_PERIODS = {
+    "1m": "7d",
+    "2m": "60d",
+    "5m": "60d",
+    "15m": "60d",
+    "1h": "730d",
+    "1d": "max",
+}
+
+
+def period_start(period, now=None):
+    """Return the UTC timestamp a period query starts from (None = no lower bound)"""
+    now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+    if now.tzinfo is None:
+        now = now.tz_localize("UTC")
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1, tz="UTC")
+    if period not in PERIOD_OFFSETS:
+        raise ValueError(f"Unknown period: {period}")
+    offset = PERIOD_OFFSETS[period]
+    return None if offset is None else now - offset
+
+
+class BarStore:
+    """OHLCV bars for one symbol/interval, each column a memory-mapped array"""
+
+    def __init__(self, path):
+        self.path = path
+        self._maps = {}
+        self._length = -1
+        meta_path = os.path.join(path, "meta.json")
+        self.meta = {}
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                self.meta = json.load(f)
+
+    def _file(self, column):
+        return os.path.join(self.path, f"{column}.bin")
+
+    def _disk_length(self):
+        try:
+            return os.path.getsize(self._file(TS_COLUMN)) // np.dtype(np.int64).itemsize
+        except OSError:
+            return 0
+
+    def _open(self):
+        """(Re)map the column files if they grew since the last call"""
+        length = self._disk_length()
+        if length != self._length:
+            if length == 0:
+                self._maps = {c: np.empty(0, dtype=DTYPES[c]) for c in DTYPES}
+            else:
+                self._maps = {c: np.memmap(self._file(c), dtype=DTYPES[c], mode="r", shape=(length,))
+                              for c in DTYPES}
+            self._length = length
+        return self._maps
+
+    def __len__(self):
+        return len(self._open()[TS_COLUMN])
+
+    @property
+    def timestamps(self):
+        return self._open()[TS_COLUMN]
+
+    def column(self, name):
+        return self._open()[name]
+
+    def last_timestamp(self):
+        ts = self.timestamps
+        return int(ts[-1]) if len(ts) else None
+
+    def append(self, df):
+        """Append new bars; a bar matching the last stored timestamp overwrites it"""
+        if df is None or df.empty:
+            return 0
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is None:
+            index = index.tz_localize("UTC")
+        if "tz" not in self.meta:
+            self.meta["tz"] = str(index.tz)
+        ts = index.tz_convert("UTC").as_unit("ns").asi8
+        order = np.argsort(ts, kind="stable")
+        ts = ts[order]
+        cols = {c: df[c].to_numpy(dtype=np.float64)[order] if c in df else np.zeros(len(ts)) for c in COLUMNS}
+
+        os.makedirs(self.path, exist_ok=True)
+        last = self.last_timestamp()
+        if last is not None:
+            same = ts == last
+            if same.any():
+                # The latest bar is usually still forming - refresh it in place
+                pos = np.flatnonzero(same)[-1]
+                offset = (self._disk_length() - 1) * 8
+                for c in COLUMNS:
+                    mm = np.memmap(self._file(c), dtype=DTYPES[c], mode="r+", offset=offset, shape=(1,))
+                    mm[0] = cols[c][pos]
+                    mm.flush()
+            keep = ts > last
+            ts = ts[keep]
+            cols = {c: v[keep] for c, v in cols.items()}
+        if len(ts):
+            # Drop duplicate timestamps inside the batch, keep the newest row
+            _, uniq = np.unique(ts[::-1], return_index=True)
+            uniq = len(ts) - 1 - uniq
+            ts = ts[uniq]
+            cols = {c: v[uniq] for c, v in cols.items()}
+            # Timestamps go last so a reader never sees a ts without its columns
+            for c in COLUMNS:
+                with open(self._file(c), "ab") as f:
+                    f.write(np.ascontiguousarray(cols[c], dtype=DTYPES[c]).tobytes())
+            with open(self._file(TS_COLUMN), "ab") as f:
+                f.write(np.ascontiguousarray(ts, dtype=np.int64).tobytes())
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump(self.meta, f)
+        return len(ts)
+
+    def slice(self, start=None, end=None):
+        """Zero-copy views of all columns with start <= ts < end (binary search)"""
+        maps = self._open()
+        ts = maps[TS_COLUMN]
+        lo = 0 if start is None else int(np.searchsorted(ts, pd.Timestamp(start).value, side="left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, pd.Timestamp(end).value, side="left"))
+        return {c: maps[c][lo:hi] for c in DTYPES}
+
+    def frame(self, start=None, end=None):
+        """Slice as a DataFrame indexed like yfinance history (columns are not copied)"""
+        views = self.slice(start, end)
+        index = pd.DatetimeIndex(pd.to_datetime(np.asarray(views[TS_COLUMN]), utc=True))
+        if self.meta.get("tz"):
+            index = index.tz_convert(self.meta["tz"])
+        return pd.DataFrame({c: views[c] for c in COLUMNS}, index=index, copy=False)
+
+
+class HistoryArchive:
+    """Directory of BarStores, one per (symbol, interval)"""
+
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = root
+        self._stores = {}
+        self._synced_at = {}
+        self._sync_locks = {}   # (symbol, interval) -> lock held across that key's download
+        self._lock = threading.Lock()
+
+    def store(self, symbol, interval="1d"):
+        key = (symbol.upper(), interval)
+        with self._lock:
+            if key not in self._stores:
+                self._stores[key] = BarStore(os.path.join(self.root, key[0], interval))
+            return self._stores[key]
+
+    def symbols(self):
+        """Symbols that have anything archived"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(os.listdir(self.root))
+
+    def sync(self, symbol, interval="1d", max_age=300):
+        """Download only the bars newer than what is archived; returns False if the fetch failed
+
+        Only syncs of the same symbol/interval wait on each other - a slow download of one
+        symbol's full history does not hold up the rest.
+        """
+        key = (symbol.upper(), interval)
+        with self._lock:
+            key_lock = self._sync_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if time.time() - self._synced_at.get(key, 0) < max_age:
+                return True
+            store = self.store(symbol, interval)
+            last = store.last_timestamp()
+            try:
+                ticker = yf.Ticker(key[0])
+                backfill = BACKFILL_PERIODS.get(interval, "max")
+                start = None if last is None else pd.Timestamp(last, tz="UTC").floor("D")
+                # Yahoo only serves intraday bars so far back - past that, refetch the whole window
+                reach = None if backfill == "max" else pd.Timedelta(backfill)
+                if start is None or (reach is not None and pd.Timestamp.now(tz="UTC") - start >= reach):
+                    df = ticker.history(period=backfill, interval=interval)
+                else:
+                    df = ticker.history(start=start, interval=interval)
+            except Exception:
+                return False
+            store.append(df)
+            self._synced_at[key] = time.time()
+            return True
+
+    def query(self, symbol, interval="1d", period="max", now=None):
+        """Bars for a period such as "1mo" or "5y", sliced straight out of the archive"""
+        return self.store(symbol, interval).frame(start=period_start(period, now))
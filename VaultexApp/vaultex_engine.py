@@ -0,0 +1,763 @@
+"""Vaultex trading engine - paper accounts and orders, usable without Streamlit"""
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from vaultex_execution import trades_whole_units
+from vaultex_money import (MONEY_SCALE, QTY_SCALE, from_minor, from_units, notional,
+                           notional_array, split_cost, to_minor, to_units)
+from vaultex_stats import TradeStats
+
+STARTING_BALANCE = 25000.0
+API_PORT = 8765
+
+# Margin accounts
+DEFAULT_LEVERAGE = 2.0
+LEVERAGE_CHOICES = (1.5, 2.0, 3.0, 4.0, 5.0)
+DEFAULT_BORROW_RATE = 0.05      # yearly, charged on the value of short positions
+MAINTENANCE_MARGIN = 0.25       # equity must stay above this share of gross exposure
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+SIDES = ("BUY", "SELL")
+ORDER_TYPES = ("MARKET", "LIMIT")
+
+
+def last_close(symbol):
+    """Default price source - last daily close from Yahoo Finance"""
+    try:
+        data = yf.Ticker(symbol).history(period="1d")
+        if not data.empty:
+            return float(data['Close'].iloc[-1])
+    except Exception:
+        pass
+    return 0.0
+
+
+class OrderError(ValueError):
+    """Raised when an order or basket is rejected"""
+
+
+class PositionBook:
+    """Dense account x symbol matrix of units, plus per-account cash and margin settings
+
+    Every fill writes one cell, so risk checks over all accounts are plain array maths.
+    Net asset value is kept up to date incrementally: a price tick adds units x price move
+    to every account at once, a fill or cash movement touches only its own row.
+    """
+
+    # Per-account columns: name -> (dtype, initial value)
+    ROW_FIELDS = {
+        "cash": (np.int64, 0),
+        "margin": (bool, False),
+        "leverage": (float, 1.0),
+        "borrow_rate": (float, 0.0),
+        "borrow_accrued": (float, 0.0),
+        "nav": (float, 0.0),             # cash + marked positions, paisa
+        "contributed": (np.int64, 0),    # starting stake + deposits, paisa
+        "flows": (float, 0.0),           # deposits / resets since the last leaderboard sample
+        "restarted": (bool, False),      # account was reset since the last leaderboard sample
+        "moved": (bool, False),          # NAV or stake changed since the leaderboard last re-ranked
+    }
+
+    def __init__(self, capacity=8):
+        self.names = []
+        self.rows = {}
+        self.cols = {}
+        self.units = np.zeros((capacity, capacity), dtype=np.int64)
+        self.prices = np.zeros(capacity)
+        for name, (dtype, fill) in self.ROW_FIELDS.items():
+            setattr(self, name, np.full(capacity, fill, dtype=dtype))
+
+    def row(self, name):
+        if name not in self.rows:
+            n = len(self.names)
+            if n == len(self.cash):
+                self.units = np.vstack([self.units, np.zeros((n, self.units.shape[1]), dtype=np.int64)])
+                for field, (dtype, fill) in self.ROW_FIELDS.items():
+                    setattr(self, field, np.concatenate([getattr(self, field), np.full(n, fill, dtype=dtype)]))
+            self.rows[name] = n
+            self.names.append(name)
+        return self.rows[name]
+
+    def col(self, symbol):
+        if symbol not in self.cols:
+            m = len(self.cols)
+            if m == self.units.shape[1]:
+                self.units = np.hstack([self.units, np.zeros((self.units.shape[0], m), dtype=np.int64)])
+                self.prices = np.concatenate([self.prices, np.zeros(m)])
+            self.cols[symbol] = m
+        return self.cols[symbol]
+
+    def set_price(self, symbol, price):
+        col = self.col(symbol)
+        n = len(self.names)
+        self.nav[:n] += self.units[:n, col] * ((price - self.prices[col]) * (MONEY_SCALE / QTY_SCALE))
+        self.prices[col] = price
+        self.moved[:n] |= self.units[:n, col] != 0
+
+    def set_units(self, row, symbol, units):
+        col = self.col(symbol)
+        self.nav[row] += (units - self.units[row, col]) * self.prices[col] * (MONEY_SCALE / QTY_SCALE)
+        self.units[row, col] = units
+        self.moved[row] = True
+
+    def add_cash(self, rows, amount):
+        self.cash[rows] += amount
+        self.nav[rows] += amount
+        self.moved[rows] = True
+
+    def values(self, rows=None):
+        """Signed market value of every position in paisa (accounts x symbols)"""
+        n, m = len(self.names), len(self.cols)
+        units = self.units[:n, :m] if rows is None else self.units[rows, :m]
+        return units * self.prices[:m] * (MONEY_SCALE / QTY_SCALE)
+
+
+class Account:
+    """Cash, holdings, FIFO tax lots and trade log for one user - all money in integer paisa
+
+    Positions are signed: margin accounts may hold negative (short) units.
+    """
+
+    def __init__(self, username, balance=STARTING_BALANCE, book=None):
+        self.username = username
+        self.book = PositionBook() if book is None else book
+        self.row = self.book.row(username)
+        self.reset(balance)
+
+    def reset(self, balance):
+        nav_before = self.book.nav[self.row]
+        for symbol in getattr(self, "units", {}):
+            self.book.set_units(self.row, symbol, 0)
+        self.cash = to_minor(balance)
+        self.book.contributed[self.row] = self.cash
+        self.book.flows[self.row] += self.book.nav[self.row] - nav_before
+        self.book.restarted[self.row] = True
+        self.book.moved[self.row] = True
+        self.book.margin[self.row] = False
+        self.book.leverage[self.row] = 1.0
+        self.book.borrow_rate[self.row] = 0.0
+        self.book.borrow_accrued[self.row] = 0.0
+        self.units = {}       # symbol -> signed quantity in 1e-8 units
+        self.lots = {}        # symbol -> deque of [units, cost, opened_at], oldest first, same sign as the position
+        self.cost_basis = {}  # symbol -> cost of the open lots (negative for shorts)
+        self.realized = 0
+        self.stats = TradeStats()
+        self.log = []
+        self.journal = [(time.time(), None, 0, self.cash)]  # (ts, symbol, signed units, cash delta) for the equity curve
+
+    @property
+    def cash(self):
+        return int(self.book.cash[self.row])
+
+    @cash.setter
+    def cash(self, value):
+        self.book.add_cash(self.row, value - self.book.cash[self.row])
+
+    @property
+    def margin(self):
+        return bool(self.book.margin[self.row])
+
+    @property
+    def leverage(self):
+        return float(self.book.leverage[self.row])
+
+    @property
+    def balance(self):
+        return from_minor(self.cash)
+
+    @property
+    def holdings(self):
+        # Read paths work on copies: the API thread may fill orders while the UI iterates
+        return {symbol: from_units(units) for symbol, units in self.units.copy().items()}
+
+    @property
+    def realized_pnl(self):
+        return from_minor(self.realized)
+
+    def trade(self, symbol, units, total):
+        """Apply a fill of signed `units` costing `total` paisa; opposite lots are closed FIFO first.
+
+        Returns the realized P&L in paisa, or None if nothing was closed.
+        """
+        side = 1 if units > 0 else -1
+        now = time.time()
+        self.cash -= side * total
+        self.journal.append((now, symbol, units, -side * total))
+        position = self.units.get(symbol, 0)
+        lots = self.lots.setdefault(symbol, deque())
+        remaining, remaining_total, pnl = abs(units), total, None
+
+        if position and (position > 0) != (units > 0):
+            closing = min(abs(position), remaining)
+            close_value = split_cost(total, remaining, closing)
+            cost, left, held = 0, closing, 0.0
+            while left:
+                lot = lots[0]
+                lot_units, lot_cost = abs(lot[0]), abs(lot[1])
+                take = min(lot_units, left)
+                taken = split_cost(lot_cost, lot_units, take)
+                cost += taken
+                held += take * (now - lot[2])
+                left -= take
+                if take == lot_units:
+                    lots.popleft()
+                else:
+                    lot[0] += side * take
+                    lot[1] += side * taken
+            pnl = close_value - cost if position > 0 else cost - close_value
+            self.stats.observe(pnl, cost, held / closing)
+            self.cost_basis[symbol] += side * cost
+            remaining -= closing
+            remaining_total -= close_value
+
+        if remaining:
+            lots.append([side * remaining, side * remaining_total, now])
+            self.cost_basis[symbol] = self.cost_basis.get(symbol, 0) + side * remaining_total
+
+        position += units
+        self.book.set_units(self.row, symbol, position)
+        if position == 0:
+            del self.units[symbol]
+            del self.lots[symbol]
+            del self.cost_basis[symbol]
+        else:
+            self.units[symbol] = position
+        self.realized += pnl or 0
+        return pnl
+
+    def market_value(self, prices):
+        """Value of all holdings in paisa, summed exactly (shorts count negative)"""
+        held = self.units.copy()
+        symbols = list(held)
+        units = np.array([held[s] for s in symbols], dtype=np.int64)
+        price = np.array([prices.get(s, 0.0) for s in symbols], dtype=float)
+        return int(notional_array(units, price).sum())
+
+    def positions(self, prices):
+        """Per-position cost and unrealized P&L, computed column-wise"""
+        held, cost_basis = self.units.copy(), self.cost_basis.copy()
+        symbols = list(held)
+        units = np.array([held[s] for s in symbols], dtype=np.int64)
+        cost = np.array([cost_basis.get(s, 0) for s in symbols], dtype=np.int64)
+        price = np.array([prices.get(s, 0.0) for s in symbols], dtype=float)
+        value = notional_array(units, price)
+        unrealized = value - cost
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_cost = np.where(units != 0, cost / MONEY_SCALE / (units / QTY_SCALE), 0.0)
+            pct = np.where(cost != 0, unrealized / np.abs(cost) * 100, 0.0)
+        return pd.DataFrame({"Asset": symbols, "Quantity": [from_units(u) for u in units], "Avg Cost": avg_cost,
+                             "Current Price": price, "Total Value": value / MONEY_SCALE,
+                             "Unrealized P&L": unrealized / MONEY_SCALE, "P&L %": pct})
+
+    def margin_status(self):
+        """Equity, gross exposure and buying power in PKR at the book's last prices"""
+        values = self.book.values(self.row)
+        equity = float(self.cash + values.sum())
+        gross = float(np.abs(values).sum())
+        return {"equity": from_minor(equity), "exposure": from_minor(gross),
+                "buying_power": from_minor(max(0.0, equity * self.leverage - gross)),
+                "maintenance": from_minor(MAINTENANCE_MARGIN * gross)}
+
+    def to_dict(self):
+        return {"username": self.username, "balance": self.balance, "cash_minor": self.cash,
+                "holdings": self.holdings, "realized_pnl": self.realized_pnl,
+                "margin": self.margin, "leverage": self.leverage, "trades": len(self.log)}
+
+
+class Order:
+    """A paper order and its lifecycle (OPEN -> FILLED / PARTIAL / CANCELLED / REJECTED)"""
+
+    __slots__ = ("id", "username", "symbol", "side", "qty", "order_type", "limit_price",
+                 "status", "fill_price", "filled_qty", "realized_pnl", "reason", "created", "updated")
+
+    def __init__(self, order_id, username, symbol, side, qty, order_type, limit_price):
+        self.id = order_id
+        self.username = username
+        self.symbol = symbol
+        self.side = side
+        self.qty = qty
+        self.order_type = order_type
+        self.limit_price = limit_price
+        self.status = "OPEN"
+        self.fill_price = None
+        self.filled_qty = 0
+        self.realized_pnl = None
+        self.reason = None
+        self.created = self.updated = time.time()
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class TradingEngine:
+    """Thread-safe order engine shared by the UI, bots and the HTTP API"""
+
+    def __init__(self, starting_balance=STARTING_BALANCE, price_source=None, fill_model=None):
+        self.starting_balance = starting_balance
+        self.price_source = price_source
+        self.fill_model = fill_model
+        self.accounts = {}
+        self.orders = {}
+        self.last_prices = {}
+        self.book = PositionBook()
+        self._open_by_symbol = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._last_accrual = time.time()
+
+    # --- Accounts ---
+    def account(self, username):
+        """Get (or open) the account for a user"""
+        with self._lock:
+            if username not in self.accounts:
+                self.accounts[username] = Account(username, self.starting_balance, self.book)
+            return self.accounts[username]
+
+    def set_margin(self, username, enabled=True, leverage=DEFAULT_LEVERAGE, borrow_rate=DEFAULT_BORROW_RATE):
+        """Turn a cash account into a margin account (or back, once it is flat on shorts and borrowing)"""
+        with self._lock:
+            account = self.account(username)
+            if not enabled and (account.cash < 0 or any(u < 0 for u in account.units.values())):
+                raise OrderError("CLOSE SHORTS AND REPAY MARGIN FIRST")
+            if enabled and leverage not in LEVERAGE_CHOICES:
+                raise OrderError(f"LEVERAGE MUST BE ONE OF {', '.join(f'{x:g}' for x in LEVERAGE_CHOICES)}")
+            row = account.row
+            self.book.margin[row] = enabled
+            self.book.leverage[row] = leverage if enabled else 1.0
+            self.book.borrow_rate[row] = borrow_rate if enabled else 0.0
+            return account
+
+    def deposit(self, username, amount):
+        if amount <= 0:
+            raise OrderError("DEPOSIT MUST BE POSITIVE")
+        with self._lock:
+            account = self.account(username)
+            minor = to_minor(amount)
+            account.cash += minor
+            account.journal.append((time.time(), None, 0, minor))
+            self.book.contributed[account.row] += minor
+            self.book.flows[account.row] += minor
+            self.book.moved[account.row] = True
+            return account.balance
+
+    def reset(self, username):
+        """Back to the starting stake; open orders are cancelled"""
+        with self._lock:
+            for order in self.list_orders(username, status="OPEN"):
+                self.cancel_order(order.id)
+            account = self.account(username)
+            account.reset(self.starting_balance)
+            return account
+
+    # --- Prices ---
+    def price(self, symbol):
+        """Latest known price, falling back to the price source"""
+        price = self.last_prices.get(symbol, 0.0)
+        if price <= 0 and self.price_source is not None:
+            price = self.price_source(symbol)
+            if price > 0:
+                self._set_price(symbol, price)
+        return price
+
+    def on_price(self, symbol, price):
+        """Record a new price, fill any resting limit orders it crosses and re-check margin"""
+        filled = []
+        with self._lock:
+            self._set_price(symbol, price)
+            for order_id in list(self._open_by_symbol.get(symbol, ())):
+                order = self.orders[order_id]
+                if self._marketable(order, price):
+                    self._fill(order, order.limit_price)
+                    filled.append(order)
+            self.check_margin()
+        return filled
+
+    def check_margin(self, now=None):
+        """Accrue borrow cost and liquidate margin accounts below maintenance - one pass over the whole book.
+
+        Returns the usernames that were liquidated.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            book = self.book
+            n = len(book.names)
+            values = book.values()
+            short_value = -np.minimum(values, 0).sum(axis=1)
+            years = max(0.0, now - self._last_accrual) / SECONDS_PER_YEAR
+            self._last_accrual = now
+            accrued = book.borrow_accrued[:n] + short_value * book.borrow_rate[:n] * years
+            charge = np.floor(accrued).astype(np.int64)
+            book.add_cash(slice(0, n), -charge)
+            book.borrow_accrued[:n] = accrued - charge
+            for row in np.flatnonzero(charge):
+                # Journalled like a cash movement, so the equity curve carries the cost too
+                self.accounts[book.names[row]].journal.append((now, None, 0, -int(charge[row])))
+
+            equity = book.cash[:n] + values.sum(axis=1)
+            gross = np.abs(values).sum(axis=1)
+            breached = book.margin[:n] & (gross > 0) & (equity < MAINTENANCE_MARGIN * gross)
+            liquidated = [book.names[row] for row in np.flatnonzero(breached)]
+            for username in liquidated:
+                self._liquidate(username)
+            return liquidated
+
+    # --- Orders ---
+    def submit_order(self, username, symbol, side, qty, order_type="MARKET", limit_price=None, price=None, bar=None):
+        """Place an order; market orders fill immediately, limit orders rest until marketable.
+
+        Pass the latest OHLCV `bar` to have the engine's fill model price market orders
+        (spread, slippage, partial fills); without it they fill in full at the last price.
+        """
+        symbol = symbol.strip().upper()
+        side = side.upper()
+        order_type = order_type.upper()
+        if side not in SIDES:
+            raise OrderError(f"UNKNOWN SIDE {side}")
+        if order_type not in ORDER_TYPES:
+            raise OrderError(f"UNKNOWN ORDER TYPE {order_type}")
+        if qty <= 0:
+            raise OrderError("QUANTITY MUST BE POSITIVE")
+        if order_type == "LIMIT" and (limit_price is None or limit_price <= 0):
+            raise OrderError("LIMIT ORDERS NEED A LIMIT PRICE")
+
+        with self._lock:
+            if price is not None and price > 0:
+                self._set_price(symbol, price)
+            market = self.price(symbol)
+            order = Order(next(self._ids), username, symbol, side, qty, order_type, limit_price)
+            self.orders[order.id] = order
+            self.account(username)
+
+            if order_type == "MARKET":
+                if bar is not None and self.fill_model is not None:
+                    fill_price, fill_qty = self.fill_model.fill_bar(side, qty, bar, whole=trades_whole_units(symbol))
+                    if fill_qty <= 0:
+                        return self._reject(order, "NO LIQUIDITY")
+                    return self._fill(order, fill_price, qty=from_units(to_units(fill_qty)))
+                if market <= 0:
+                    return self._reject(order, f"NO PRICE FOR {symbol}")
+                return self._fill(order, market)
+            if market > 0 and self._marketable(order, market):
+                return self._fill(order, limit_price)
+            self._open_by_symbol.setdefault(symbol, set()).add(order.id)
+            return order
+
+    def cancel_order(self, order_id):
+        with self._lock:
+            order = self.orders.get(order_id)
+            if order is None:
+                raise OrderError(f"UNKNOWN ORDER {order_id}")
+            if order.status == "OPEN":
+                order.status = "CANCELLED"
+                order.updated = time.time()
+                self._open_by_symbol.get(order.symbol, set()).discard(order.id)
+            return order
+
+    def get_order(self, order_id):
+        return self.orders.get(order_id)
+
+    def list_orders(self, username=None, status=None):
+        with self._lock:
+            return [o for o in self.orders.values()
+                    if (username is None or o.username == username) and (status is None or o.status == status)]
+
+    def submit_basket(self, username, orders, quotes, bars=None):
+        """Price, validate and fill a basket of orders all-or-nothing
+
+        Market rows fill at once at the quote; limit rows whose limit the quote has reached fill
+        at their limit, the same as submit_order, and the others rest as open orders. `bars` (symbol -> latest OHLCV bar) lets the
+        fill model price all market rows in one call.
+        """
+        orders = pd.DataFrame(orders).dropna(subset=["Symbol", "Side", "Quantity"])
+        if "Type" not in orders:
+            orders["Type"] = "MARKET"
+        if "Limit Price" not in orders:
+            orders["Limit Price"] = float("nan")
+        orders["Symbol"] = orders["Symbol"].astype(str).str.strip().str.upper()
+        orders["Side"] = orders["Side"].astype(str).str.strip().str.upper()
+        orders["Type"] = orders["Type"].fillna("MARKET").astype(str).str.strip().str.upper()
+        orders = orders[(orders["Symbol"] != "") & (orders["Quantity"] > 0)]
+        if orders.empty:
+            raise OrderError("BASKET IS EMPTY")
+        bad_sides = orders.loc[~orders["Side"].isin(SIDES), "Side"].unique()
+        if len(bad_sides):
+            raise OrderError(f"UNKNOWN SIDE {', '.join(bad_sides)}")
+        bad_types = orders.loc[~orders["Type"].isin(ORDER_TYPES), "Type"].unique()
+        if len(bad_types):
+            raise OrderError(f"UNKNOWN ORDER TYPE {', '.join(bad_types)}")
+        unpriced = orders.loc[(orders["Type"] == "LIMIT") & ~(orders["Limit Price"].fillna(0) > 0), "Symbol"].unique()
+        if len(unpriced):
+            raise OrderError(f"LIMIT ORDERS NEED A LIMIT PRICE ({', '.join(unpriced)})")
+
+        quote = orders["Symbol"].map(quotes).fillna(0.0).to_numpy(dtype=float)
+        is_limit = (orders["Type"] == "LIMIT").to_numpy()
+        missing = orders.loc[~is_limit & (quote <= 0), "Symbol"].unique()
+        if len(missing):
+            raise OrderError(f"NO QUOTE FOR {', '.join(missing)}")
+
+        # A limit row fills only once the quote has reached its limit, else it rests
+        limit = orders["Limit Price"].to_numpy(dtype=float)
+        buying = (orders["Side"] == "BUY").to_numpy()
+        reached = (quote > 0) & np.where(buying, quote <= limit, quote >= limit)
+        resting = orders[is_limit & ~reached]
+        now = ~is_limit | reached
+        orders, quote, limit, is_limit = orders[now], quote[now], limit[now], is_limit[now]
+        if orders.empty:
+            with self._lock:
+                return self._rest_all(username, resting)
+
+        price = np.where(is_limit, limit, quote)
+        sign = np.where(orders["Side"] == "BUY", 1, -1).astype(np.int64)
+        quantity = orders["Quantity"].to_numpy(dtype=float, copy=True)
+        if self.fill_model is not None and bars:
+            modelled = ~is_limit & orders["Symbol"].isin(list(bars)).to_numpy()
+            if modelled.any():
+                bar = pd.DataFrame([bars[s] for s in orders["Symbol"][modelled]])
+                whole = orders["Symbol"][modelled].map(trades_whole_units).to_numpy(dtype=bool)
+                price[modelled], quantity[modelled] = self.fill_model.fill(
+                    sign[modelled], quantity[modelled], bar["Open"], bar["High"], bar["Low"], bar["Close"], bar["Volume"],
+                    whole=whole
+                )
+        if not (quantity > 0).any():
+            raise OrderError("NO LIQUIDITY")
+        units = np.rint(quantity * QTY_SCALE).astype(np.int64)
+        totals = notional_array(units, price)
+        with self._lock:
+            account = self.account(username)
+            for symbol, q in quotes.items():
+                if q > 0:
+                    self._set_price(symbol, q)
+            cash_after = account.cash - int((sign * totals).sum())
+            units_delta = pd.Series(sign * units).groupby(orders["Symbol"].to_numpy()).sum()
+            units_after = units_delta + pd.Series(account.units, dtype=np.int64).reindex(units_delta.index).fillna(0)
+            if account.margin:
+                # Same rule as single orders: fit inside equity x leverage, or at least reduce exposure
+                if not self._within_margin(account, units_after.index, units_after.to_numpy(dtype=np.int64), cash_after):
+                    raise OrderError("INSUFFICIENT MARGIN")
+            else:
+                if cash_after < 0:
+                    raise OrderError(f"INSUFFICIENT FUNDS (short PKR {from_minor(-cash_after):,.2f})")
+                short = units_after[units_after < 0]
+                if not short.empty:
+                    raise OrderError(f"INSUFFICIENT POSITION IN {', '.join(short.index)}")
+
+            # Everything checked - apply in one go, buys first so sells can close them
+            filled = []
+            for sym, side, q, order_type, p, u, total in zip(orders["Symbol"], orders["Side"], orders["Quantity"],
+                                                             orders["Type"], price, units, totals):
+                order = Order(next(self._ids), username, sym, side, from_units(to_units(q)), order_type, float(p))
+                order.fill_price = float(p)
+                order.filled_qty = from_units(u)
+                self.orders[order.id] = order
+                if u == 0:
+                    self._reject(order, "NO LIQUIDITY")
+                    continue
+                order.status = "FILLED" if order.filled_qty >= q else "PARTIAL"
+                filled.append((order, int(u), int(total)))
+            for order, u, total in sorted(filled, key=lambda f: f[0].side != "BUY"):
+                pnl = account.trade(order.symbol, u if order.side == "BUY" else -u, total)
+                if pnl is not None:
+                    order.realized_pnl = from_minor(pnl)
+            filled = [f[0] for f in filled]
+            account.log.extend(self._log_line(o) for o in filled)
+            return filled + self._rest_all(username, resting)
+
+    def _rest_all(self, username, resting):
+        """Book basket limit rows that are not yet marketable as open orders"""
+        rested = []
+        for sym, side, q, limit in zip(resting["Symbol"], resting["Side"], resting["Quantity"], resting["Limit Price"]):
+            order = Order(next(self._ids), username, sym, side, from_units(to_units(q)), "LIMIT", float(limit))
+            self.orders[order.id] = order
+            self._open_by_symbol.setdefault(sym, set()).add(order.id)
+            rested.append(order)
+        return rested
+
+    # --- Internals ---
+    @staticmethod
+    def _marketable(order, price):
+        if order.side == "BUY":
+            return price <= order.limit_price
+        return price >= order.limit_price
+
+    def _set_price(self, symbol, price):
+        self.last_prices[symbol] = price
+        self.book.set_price(symbol, price)
+
+    def _liquidate(self, username):
+        """Close every position of a margin account at the last price
+
+        A symbol with no known price is left open rather than closed out at zero.
+        """
+        account = self.accounts[username]
+        for order in self.list_orders(username, status="OPEN"):
+            self.cancel_order(order.id)
+        for symbol, units in list(account.units.items()):
+            price = self.last_prices.get(symbol, 0.0)
+            if price <= 0:
+                continue
+            order = Order(next(self._ids), username, symbol, "SELL" if units > 0 else "BUY",
+                          from_units(abs(units)), "LIQUIDATION", None)
+            order.reason = "MARGIN CALL"
+            self.orders[order.id] = order
+            self._fill(order, price, check=False)
+
+    @staticmethod
+    def _log_line(order):
+        timestamp = datetime.fromtimestamp(order.updated).strftime("%H:%M:%S")
+        icon = "🟢" if order.side == "BUY" else "🔴"
+        if order.order_type == "LIQUIDATION":
+            icon = "⚠️"
+        line = f"{icon} {timestamp} | {order.side} {order.filled_qty} {order.symbol} @ PKR {order.fill_price:.2f}"
+        if order.status == "PARTIAL":
+            line += f" (partial of {order.qty})"
+        if order.realized_pnl is not None:
+            line += f" | P&L PKR {order.realized_pnl:+,.2f}"
+        return line
+
+    def _reject(self, order, reason):
+        order.status = "REJECTED"
+        order.reason = reason
+        order.updated = time.time()
+        self._open_by_symbol.get(order.symbol, set()).discard(order.id)
+        return order
+
+    def _within_margin(self, account, symbols, units_after, cash_after, prices=None):
+        """Would holding `units_after` of `symbols` keep gross exposure within equity x leverage
+        (or at least reduce it)? Positions are marked at `prices`, else at the book's prices."""
+        cols = [self.book.col(s) for s in symbols]
+        values = self.book.values(account.row)
+        prices = self.book.prices[cols] if prices is None else np.asarray(prices, dtype=float)
+        after = values.copy()
+        after[cols] = np.asarray(units_after) * prices * (MONEY_SCALE / QTY_SCALE)
+        gross, gross_after = np.abs(values).sum(), np.abs(after).sum()
+        return gross_after <= gross or gross_after <= (cash_after + after.sum()) * account.leverage
+
+    def _fill(self, order, price, check=True, qty=None):
+        account = self.account(order.username)
+        qty = order.qty if qty is None else qty
+        units = to_units(qty)
+        total = notional(units, price)
+        signed = units if order.side == "BUY" else -units
+        if check:
+            if account.margin:
+                units_after = account.units.get(order.symbol, 0) + signed
+                cash_after = account.cash - (total if signed > 0 else -total)
+                if not self._within_margin(account, [order.symbol], [units_after], cash_after, [price]):
+                    return self._reject(order, "INSUFFICIENT MARGIN")
+            elif order.side == "BUY" and account.cash < total:
+                return self._reject(order, "INSUFFICIENT FUNDS")
+            elif order.side == "SELL" and account.units.get(order.symbol, 0) < units:
+                return self._reject(order, "INSUFFICIENT POSITION")
+        pnl = account.trade(order.symbol, signed, total)
+        if pnl is not None:
+            order.realized_pnl = from_minor(pnl)
+        order.status = "FILLED" if qty >= order.qty else "PARTIAL"
+        order.fill_price = price
+        order.filled_qty = qty
+        order.updated = time.time()
+        self._open_by_symbol.get(order.symbol, set()).discard(order.id)
+        account.log.append(self._log_line(order))
+        return order
+
+
+# --- HTTP/JSON API ---
+class _ApiHandler(BaseHTTPRequestHandler):
+    """
+    GET    /accounts/<user>            account snapshot
+    GET    /orders?username=&status=   list orders
+    GET    /orders/<id>                one order
+    POST   /orders                     {"username", "symbol", "side", "qty", "type", "limit_price", "price", "bar"}
+    POST   /baskets                    {"username", "orders": [{Symbol, Side, Quantity, Type, Limit Price}], "quotes", "bars"}
+    POST   /prices                     {"symbol", "price"}
+    DELETE /orders/<id>                cancel
+    """
+    engine = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _route(self):
+        url = urlparse(self.path)
+        return [p for p in url.path.split("/") if p], {k: v[0] for k, v in parse_qs(url.query).items()}
+
+    def _handle(self, action):
+        try:
+            self._send(200, action())
+        except OrderError as e:
+            self._send(400, {"error": str(e)})
+        except (KeyError, ValueError, TypeError) as e:
+            self._send(400, {"error": f"BAD REQUEST: {e}"})
+
+    def do_GET(self):
+        parts, query = self._route()
+
+        def action():
+            if parts[:1] == ["accounts"] and len(parts) == 2:
+                return self.engine.account(parts[1]).to_dict()
+            if parts == ["orders"]:
+                return [o.to_dict() for o in self.engine.list_orders(query.get("username"), query.get("status"))]
+            if parts[:1] == ["orders"] and len(parts) == 2:
+                order = self.engine.get_order(int(parts[1]))
+                if order is None:
+                    raise OrderError(f"UNKNOWN ORDER {parts[1]}")
+                return order.to_dict()
+            raise KeyError(self.path)
+        self._handle(action)
+
+    def do_POST(self):
+        parts, _ = self._route()
+
+        def action():
+            data = self._body()
+            if parts == ["orders"]:
+                return self.engine.submit_order(
+                    data["username"], data["symbol"], data["side"], data["qty"],
+                    data.get("type", "MARKET"), data.get("limit_price"), data.get("price"), data.get("bar")
+                ).to_dict()
+            if parts == ["baskets"]:
+                filled = self.engine.submit_basket(data["username"], data["orders"], data.get("quotes", {}),
+                                                   data.get("bars"))
+                return [o.to_dict() for o in filled]
+            if parts == ["prices"]:
+                return [o.to_dict() for o in self.engine.on_price(data["symbol"].upper(), float(data["price"]))]
+            raise KeyError(self.path)
+        self._handle(action)
+
+    def do_DELETE(self):
+        parts, _ = self._route()
+
+        def action():
+            if parts[:1] == ["orders"] and len(parts) == 2:
+                return self.engine.cancel_order(int(parts[1])).to_dict()
+            raise KeyError(self.path)
+        self._handle(action)
+
+
+def start_api_server(engine, host="127.0.0.1", port=API_PORT):
+    """Serve the engine over HTTP/JSON from a daemon thread; returns the server"""
+    handler = type("VaultexApiHandler", (_ApiHandler,), {"engine": engine})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="vaultex-api").start()
+    return server
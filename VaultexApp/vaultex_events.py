@@ -0,0 +1,55 @@
+"""Vaultex events - headlines aligned to the bar timeline and the price move that followed
+
+Publish times are matched to bars with one `merge_asof` (each headline lands on the bar it
+was published in), and the move over the next N bars is read off with array indexing, so a
+batch of headlines costs a sort and a couple of vectorized lookups.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _utc_index(index):
+    index = pd.DatetimeIndex(index)
+    return index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+
+
+def align_headlines(headlines, bars, horizon=5):
+    """One row per headline inside the bar window
+
+    `headlines` needs Published (UTC) and Title columns. Returns Published, Title, Bar (the
+    bar's own timestamp), Position, Marker (a y just above that bar's high, stacked when
+    several headlines share a bar), Move % (open of the headline bar to the close `horizon`
+    bars later) and Bars (how many following bars the move covers - fewer near the end).
+    """
+    columns = ["Published", "Title", "Bar", "Position", "Marker", "Move %", "Bars"]
+    if headlines is None or headlines.empty or bars.empty:
+        return pd.DataFrame(columns=columns)
+    bar_times = pd.DataFrame({"BarUTC": _utc_index(bars.index), "Position": np.arange(len(bars))})
+    news = headlines[["Published", "Title"]].copy()
+    news["Published"] = pd.to_datetime(news["Published"], utc=True).astype(bar_times["BarUTC"].dtype)
+    news = news.sort_values("Published")
+    merged = pd.merge_asof(news, bar_times, left_on="Published", right_on="BarUTC", direction="backward")
+    merged = merged.dropna(subset=["Position"])  # published before the first bar
+    if merged.empty:
+        return pd.DataFrame(columns=columns)
+
+    pos = merged["Position"].to_numpy(dtype=np.int64)
+    last = len(bars) - 1
+    end = np.minimum(pos + horizon, last)
+    opens = bars["Open"].to_numpy(dtype=float)
+    closes = bars["Close"].to_numpy(dtype=float)
+    highs = bars["High"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        move = (closes[end] / opens[pos] - 1) * 100
+    stack = merged.groupby("Position").cumcount().to_numpy()
+    span = float(np.nanmax(highs) - np.nanmin(bars["Low"].to_numpy(dtype=float))) or abs(float(highs[-1])) * 0.01
+
+    return pd.DataFrame({
+        "Published": merged["Published"].to_numpy(),
+        "Title": merged["Title"].to_numpy(),
+        "Bar": bars.index[pos],
+        "Position": pos,
+        "Marker": highs[pos] + span * 0.03 * (stack + 1),
+        "Move %": move,
+        "Bars": end - pos,
+    })
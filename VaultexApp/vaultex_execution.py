@@ -0,0 +1,80 @@
+"""Vaultex execution models - how an order of a given size fills against an OHLCV bar
+
+Every model works on arrays (one element per order) so the same code prices a single
+UI click, a basket, or a whole backtest in one call.
+"""
+import numpy as np
+
+from vaultex_money import QTY_SCALE
+
+# Yahoo suffixes of instruments that trade in fractions: crypto pairs, FX, futures
+CRYPTO_SUFFIXES = ("-USD", "-USDT", "-EUR", "-GBP", "-BTC", "-ETH")
+FRACTIONAL_SUFFIXES = CRYPTO_SUFFIXES + ("=X", "=F")
+
+
+def trades_whole_units(symbol):
+    """True for share-like symbols, False for crypto / FX / futures that trade in fractions"""
+    return not str(symbol).upper().endswith(FRACTIONAL_SUFFIXES)
+
+
+def is_crypto(symbol):
+    """True for crypto pairs, which trade every calendar day"""
+    return str(symbol).upper().endswith(CRYPTO_SUFFIXES)
+
+
+def _as_arrays(*values):
+    return np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in values])
+
+
+class FillModel:
+    """Fills the whole quantity at the bar close - the terminal's original behaviour"""
+
+    def fill(self, side, qty, open_, high, low, close, volume, whole=None):
+        """Return (fill_price, filled_qty) arrays; side is +1 for buys and -1 for sells
+
+        `whole` (bool, or one per order) says whether the instrument trades in whole units.
+        """
+        side, qty, close = _as_arrays(side, qty, close)
+        return close.copy(), qty.copy()
+
+    def fill_bar(self, side, qty, bar, whole=None):
+        """Single order against one bar (a dict / Series with Open, High, Low, Close, Volume)"""
+        price, filled = self.fill(1 if side == "BUY" else -1, qty, bar["Open"], bar["High"],
+                                  bar["Low"], bar["Close"], bar["Volume"], whole=whole)
+        return float(price), float(filled)
+
+
+class OHLCVFillModel(FillModel):
+    """Spread + square-root market impact + participation cap, all estimated from the bar
+
+    - half spread: a fraction of the bar's high-low range, never below `min_spread_bps`
+    - impact: `impact` x range volatility x sqrt(qty / bar volume)
+    - partial fills: at most `participation` x bar volume trades (bars with no volume,
+      e.g. FX, are treated as unlimited and impact-free)
+    - capped fills round down to whole units for share-like instruments and to the ledger's
+      1e-8 unit otherwise; `whole_units` is the default when a call does not say which
+    """
+
+    def __init__(self, min_spread_bps=2.0, range_spread=0.1, impact=0.5, participation=0.1, whole_units=True):
+        self.min_spread_bps = min_spread_bps
+        self.range_spread = range_spread
+        self.impact = impact
+        self.participation = participation
+        self.whole_units = whole_units
+
+    def fill(self, side, qty, open_, high, low, close, volume, whole=None):
+        side, qty, open_, high, low, close, volume = _as_arrays(side, qty, open_, high, low, close, volume)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bar_range = np.where(close > 0, (high - low) / close, 0.0)
+            half_spread = np.maximum(self.min_spread_bps / 1e4, self.range_spread * bar_range) / 2
+
+            has_volume = volume > 0
+            cap = np.where(has_volume, self.participation * volume, np.inf)
+            filled = np.minimum(qty, cap)
+            whole = self.whole_units if whole is None else np.asarray(whole, dtype=bool)
+            filled = np.where(whole, np.floor(filled), np.floor(np.round(filled * QTY_SCALE, 6)) / QTY_SCALE)
+            size_ratio = np.where(has_volume, filled / volume, 0.0)
+            slippage = self.impact * bar_range * np.sqrt(size_ratio)
+
+        price = close * (1 + side * (half_spread + slippage))
+        return price, filled
@@ -0,0 +1,228 @@
+"""Vaultex indicators - a small expression language compiled to a shared, deduplicated DAG
+
+    ema(close, 12) - ema(close, 26)
+    close > sma(close, 200) and rsi(close, 14) < 70
+
+Expressions are parsed with Python's `ast` (only the node types below are accepted) and
+interned node by node, so a subexpression that appears in several indicators - or twice in
+one - is stored and computed once. Node values are cached per (symbol, interval, window)
+and reused until that series gets a new bar.
+"""
+import ast
+import operator
+import threading
+
+import numpy as np
+import pandas as pd
+
+SERIES = {"open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"}
+
+
+class IndicatorError(ValueError):
+    """Expression that cannot be parsed or compiled"""
+
+
+def _rolling(fn):
+    return lambda x, n: getattr(pd.Series(x).rolling(n, min_periods=n), fn)().to_numpy()
+
+
+def _ema(x, n):
+    return pd.Series(x).ewm(span=n, adjust=False).mean().to_numpy()
+
+
+def _rsi(x, n):
+    delta = pd.Series(x).diff()
+    gain = delta.clip(lower=0).rolling(n, min_periods=n).mean()
+    loss = (-delta.clip(upper=0)).rolling(n, min_periods=n).mean()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (100 - 100 / (1 + gain / loss)).to_numpy()
+
+
+def _lag(x, n):
+    return pd.Series(x).shift(n).to_numpy()
+
+
+def _change(x, n):
+    return pd.Series(x).diff(n).to_numpy()
+
+
+def _cross(a, b):
+    prev_a, prev_b = _lag(a, 1), _lag(b, 1)
+    return (a > b) & (prev_a <= prev_b)
+
+
+# name -> (number of series arguments, number of integer window arguments, kernel)
+FUNCTIONS = {
+    "sma": (1, 1, _rolling("mean")),
+    "std": (1, 1, _rolling("std")),
+    "highest": (1, 1, _rolling("max")),
+    "lowest": (1, 1, _rolling("min")),
+    "ema": (1, 1, _ema),
+    "rsi": (1, 1, _rsi),
+    "lag": (1, 1, _lag),
+    "change": (1, 1, _change),
+    "abs": (1, 0, np.abs),
+    "log": (1, 0, np.log),
+    "sqrt": (1, 0, np.sqrt),
+    "crossover": (2, 0, _cross),
+    "crossunder": (2, 0, lambda a, b: _cross(b, a)),
+}
+
+_BINARY = {ast.Add: ("+", operator.add), ast.Sub: ("-", operator.sub), ast.Mult: ("*", operator.mul),
+           ast.Div: ("/", operator.truediv), ast.Pow: ("**", operator.pow)}
+_COMPARE = {ast.Gt: (">", operator.gt), ast.GtE: (">=", operator.ge), ast.Lt: ("<", operator.lt),
+            ast.LtE: ("<=", operator.le), ast.Eq: ("==", operator.eq), ast.NotEq: ("!=", operator.ne)}
+_LOGICAL = {ast.And: "and", ast.Or: "or", ast.BitAnd: "and", ast.BitOr: "or"}
+_COMMUTATIVE = {"+", "*", "==", "!=", "and", "or"}
+_MIRRORED = {"<": ">", "<=": ">="}  # a < b is stored as b > a
+_OPS = {symbol: fn for symbol, fn in list(_BINARY.values()) + list(_COMPARE.values())}
+
+
+class IndicatorEngine:
+    """Compiles expressions into one shared DAG and evaluates it against OHLCV frames"""
+
+    def __init__(self):
+        self.nodes = []       # node id -> key tuple; ids are in topological order
+        self._ids = {}        # key tuple -> node id (the deduplication table)
+        self._compiled = {}   # expression text -> root node id
+        self._values = {}     # (symbol, interval, window) -> (bar stamp, {node id: array})
+        self._lock = threading.Lock()
+
+    def _intern(self, key):
+        node = self._ids.get(key)
+        if node is None:
+            node = self._ids[key] = len(self.nodes)
+            self.nodes.append(key)
+        return node
+
+    def _op(self, op, a, b):
+        if op in _MIRRORED:
+            op, a, b = _MIRRORED[op], b, a
+        if op in _COMMUTATIVE and b < a:
+            a, b = b, a
+        return self._intern(("op", op, a, b))
+
+    def _window(self, node):
+        if not (isinstance(node, ast.Constant) and type(node.value) is int and node.value > 0):
+            raise IndicatorError("WINDOW MUST BE A POSITIVE WHOLE NUMBER")
+        return node.value
+
+    def _build(self, node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            return self._intern(("const", float(node.value)))
+        if isinstance(node, ast.Name):
+            if node.id not in SERIES:
+                raise IndicatorError(f"UNKNOWN SERIES '{node.id}' (use {', '.join(SERIES)})")
+            return self._intern(("series", node.id))
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            return self._op(_BINARY[type(node.op)][0], self._build(node.left), self._build(node.right))
+        if isinstance(node, ast.BinOp) and type(node.op) in _LOGICAL:
+            return self._op(_LOGICAL[type(node.op)], self._build(node.left), self._build(node.right))
+        if isinstance(node, ast.BoolOp):
+            values = [self._build(v) for v in node.values]
+            result = values[0]
+            for value in values[1:]:
+                result = self._op(_LOGICAL[type(node.op)], result, value)
+            return result
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return self._intern(("neg", self._build(node.operand)))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.Invert)):
+            return self._intern(("not", self._build(node.operand)))
+        if isinstance(node, ast.Compare):
+            left, result = self._build(node.left), None
+            for op, comparator in zip(node.ops, node.comparators):
+                if type(op) not in _COMPARE:
+                    raise IndicatorError("UNSUPPORTED COMPARISON")
+                right = self._build(comparator)
+                pair = self._op(_COMPARE[type(op)][0], left, right)
+                result = pair if result is None else self._op("and", result, pair)
+                left = right
+            return result
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            name = node.func.id
+            if name not in FUNCTIONS:
+                raise IndicatorError(f"UNKNOWN FUNCTION '{name}'")
+            n_series, n_windows, _ = FUNCTIONS[name]
+            if len(node.args) != n_series + n_windows:
+                raise IndicatorError(f"{name.upper()} TAKES {n_series + n_windows} ARGUMENTS")
+            inputs = tuple(self._build(arg) for arg in node.args[:n_series])
+            windows = tuple(self._window(arg) for arg in node.args[n_series:])
+            return self._intern(("call", name, inputs, windows))
+        raise IndicatorError(f"UNSUPPORTED SYNTAX: {type(node).__name__.upper()}")
+
+    def compile(self, expression):
+        """Root node id for an expression (compiled once, shared subexpressions reused)"""
+        text = " ".join(expression.split())
+        with self._lock:
+            if text not in self._compiled:
+                try:
+                    tree = ast.parse(text, mode="eval")
+                except SyntaxError as e:
+                    raise IndicatorError(f"SYNTAX ERROR: {e.msg}") from None
+                self._compiled[text] = self._build(tree.body)
+            return self._compiled[text]
+
+    def _dependencies(self, roots):
+        """Every node the roots need, in topological (id) order"""
+        needed, stack = set(), list(roots)
+        while stack:
+            node = stack.pop()
+            if node in needed:
+                continue
+            needed.add(node)
+            key = self.nodes[node]
+            if key[0] == "op":
+                stack += [key[2], key[3]]
+            elif key[0] in ("neg", "not"):
+                stack.append(key[1])
+            elif key[0] == "call":
+                stack += list(key[2])
+        return sorted(needed)
+
+    def _compute(self, key, bars, values):
+        kind = key[0]
+        if kind == "series":
+            return bars[SERIES[key[1]]].to_numpy(dtype=float)
+        if kind == "const":
+            return np.full(len(bars), key[1])
+        if kind == "neg":
+            return -values[key[1]].astype(float)
+        if kind == "not":
+            return ~values[key[1]].astype(bool)
+        if kind == "call":
+            return FUNCTIONS[key[1]][2](*[values[i] for i in key[2]], *key[3])
+        op, a, b = key[1], values[key[2]], values[key[3]]
+        if op == "and":
+            return a.astype(bool) & b.astype(bool)
+        if op == "or":
+            return a.astype(bool) | b.astype(bool)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return _OPS[op](a.astype(float), b.astype(float))  # signals count as 0 / 1
+
+    def evaluate(self, expressions, bars, symbol=None, interval=None, window=None):
+        """DataFrame with one column per expression, aligned to `bars`
+
+        With a symbol and interval, node values are cached until the bars change, so adding
+        an indicator only computes its new nodes. Callers that pass different spans of the
+        same series (a chart period vs a screener's year) give each its own `window`.
+        """
+        roots = [self.compile(e) for e in expressions]
+        if bars.empty:
+            return pd.DataFrame(index=bars.index, columns=list(expressions))
+        stamp = (len(bars), bars.index[0], bars.index[-1], float(bars["Close"].iloc[-1]))
+        with self._lock:
+            if symbol is None:
+                values = {}
+            else:
+                key = (symbol, interval, window)
+                cached = self._values.get(key)
+                if cached is None or cached[0] != stamp:
+                    cached = self._values[key] = (stamp, {})
+                values = cached[1]
+            for node in self._dependencies(roots):
+                if node not in values:
+                    try:
+                        values[node] = self._compute(self.nodes[node], bars, values)
+                    except Exception as e:
+                        raise IndicatorError(f"CANNOT EVALUATE {self.nodes[node][0].upper()} NODE: {e}") from None
+            return pd.DataFrame({e: values[r] for e, r in zip(expressions, roots)}, index=bars.index)
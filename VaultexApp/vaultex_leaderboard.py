@@ -0,0 +1,158 @@
+"""Vaultex leaderboard - return %, Sharpe and max drawdown across every paper account
+
+Net worth comes straight from the engine's PositionBook, which updates it incrementally on
+every tick and trade. The leaderboard samples it at most once per interval and folds each
+sample into per-account running statistics (vectorized Welford), so nothing is ever
+recomputed from a full history. The ranking is a sorted list kept up to date with bisect:
+only accounts the book flags as moved are taken out and re-inserted.
+"""
+import bisect
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from vaultex_engine import SECONDS_PER_YEAR
+from vaultex_money import MONEY_SCALE
+
+
+class Leaderboard:
+    """Ranks all accounts of a PositionBook"""
+
+    FIELDS = {
+        "count": 0.0,     # return samples seen
+        "mean": 0.0,      # running mean of sample returns
+        "m2": 0.0,        # running sum of squared deviations (Welford)
+        "growth": 1.0,    # compounded growth index, deposits stripped out
+        "peak": 1.0,      # running peak of the growth index
+        "max_dd": 0.0,    # worst drawdown seen, as a fraction
+        "last_nav": 0.0,  # NAV at the previous sample
+        "since": 0.0,     # time of the account's first sample - Sharpe is annualized over the span
+    }
+
+    def __init__(self, book, sample_interval=60.0):
+        self.book = book
+        self.sample_interval = sample_interval
+        self._last_sample = 0.0
+        self._ranked = []         # (-return %, row) in rank order
+        self._key = np.zeros(0)   # each row's current entry in _ranked (NaN = not ranked yet)
+        self._lock = threading.Lock()
+        for name, fill in self.FIELDS.items():
+            setattr(self, name, np.full(0, fill))
+
+    def _ensure(self, n):
+        size = len(self.count)
+        if n > size:
+            for name, fill in self.FIELDS.items():
+                setattr(self, name, np.concatenate([getattr(self, name), np.full(n - size, fill)]))
+
+    def observe(self, now=None, force=False):
+        """Fold the current NAV of every account into the running stats (at most once per interval)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            if not force and now - self._last_sample < self.sample_interval:
+                return False
+            self._last_sample = now
+            book = self.book
+            n = len(book.names)
+            self._ensure(n)
+            nav = book.nav[:n].copy()
+
+            # Accounts that were reset start their stats over
+            restarted = book.restarted[:n]
+            for name, fill in self.FIELDS.items():
+                getattr(self, name)[:n][restarted] = fill
+            book.restarted[:n] = False
+
+            prev = self.last_nav[:n]
+            has_prev = prev > 0
+            ret = np.zeros(n)
+            ret[has_prev] = (nav[has_prev] - book.flows[:n][has_prev]) / prev[has_prev] - 1
+
+            # Welford update, only for accounts that have a previous sample
+            count = self.count[:n] + has_prev
+            delta = ret - self.mean[:n]
+            mean = self.mean[:n] + np.where(has_prev, delta / np.maximum(count, 1), 0.0)
+            self.m2[:n] += np.where(has_prev, delta * (ret - mean), 0.0)
+            self.mean[:n] = mean
+            self.count[:n] = count
+
+            self.growth[:n] *= 1 + ret
+            self.peak[:n] = np.maximum(self.peak[:n], self.growth[:n])
+            self.max_dd[:n] = np.maximum(self.max_dd[:n], 1 - self.growth[:n] / self.peak[:n])
+
+            self.last_nav[:n] = nav
+            self.since[:n][self.since[:n] == 0] = now
+            book.flows[:n] = 0.0
+            return True
+
+    def _rerank(self):
+        """Take the moved accounts out of the ranking and bisect them back in at their new return"""
+        book = self.book
+        n = len(book.names)
+        if len(self._key) < n:
+            self._key = np.concatenate([self._key, np.full(n - len(self._key), np.nan)])
+        moved = np.flatnonzero(book.moved[:n] | np.isnan(self._key[:n]))
+        if not len(moved):
+            return
+        book.moved[moved] = False   # cleared before reading NAV, so a concurrent tick is not lost
+        keys = -self._returns(n)
+        if len(moved) > len(self._ranked) // 8:
+            # A tick on a widely held symbol moves most rows - one sort beats many list inserts
+            self._ranked = sorted(zip(keys.tolist(), range(n)))
+            self._key[:n] = keys
+            return
+        for row in moved.tolist():
+            old = self._key[row]
+            if not np.isnan(old):
+                del self._ranked[bisect.bisect_left(self._ranked, (old, row))]
+            bisect.insort(self._ranked, (float(keys[row]), row))
+            self._key[row] = keys[row]
+
+    def _position(self, row):
+        return bisect.bisect_left(self._ranked, (self._key[row], row)) + 1
+
+    def _returns(self, n):
+        contributed = self.book.contributed[:n].astype(float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(contributed > 0, (self.book.nav[:n] - contributed) / contributed * 100, 0.0)
+
+    def _sharpe(self, rows):
+        # Samples only happen while someone has the tab open, so the gap between them varies:
+        # annualize by how many samples actually fell per year of each account's span
+        count = self.count[rows]
+        span = self._last_sample - self.since[rows]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            std = np.sqrt(self.m2[rows] / np.maximum(count - 1, 1))
+            sharpe = self.mean[rows] / std * np.sqrt(count * SECONDS_PER_YEAR / span)
+        return np.where((count > 1) & (std > 0) & (span > 0), sharpe, np.nan)
+
+    def table(self, rows):
+        n = len(self.book.names)
+        returns = self._returns(n)
+        return pd.DataFrame({
+            "Rank": [self._position(r) for r in rows],
+            "Trader": [self.book.names[r] for r in rows],
+            "Net Worth": self.book.nav[rows] / MONEY_SCALE,
+            "Return %": returns[rows],
+            "Sharpe": self._sharpe(rows),
+            "Max DD %": self.max_dd[rows] * 100,
+        })
+
+    def top(self, n=10):
+        """Best `n` accounts by return %"""
+        with self._lock:
+            self._ensure(len(self.book.names))
+            self._rerank()
+            return self.table([row for _, row in self._ranked[:n]])
+
+    def rank(self, username):
+        """1-based rank of one account"""
+        row = self.book.rows.get(username)
+        if row is None:
+            return None
+        with self._lock:
+            self._ensure(len(self.book.names))
+            self._rerank()
+            return self._position(row)
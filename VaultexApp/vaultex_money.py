@@ -0,0 +1,47 @@
+"""Vaultex money - fixed-point integer amounts so the ledger never drifts"""
+from decimal import ROUND_HALF_EVEN, Decimal
+
+import numpy as np
+
+MONEY_SCALE = 100          # paisa per PKR
+QTY_SCALE = 100_000_000    # satoshi-scale units per coin / share
+_UNIT_FACTOR = MONEY_SCALE / QTY_SCALE
+
+
+def to_minor(amount):
+    """PKR -> integer paisa (banker's rounding)"""
+    return int((Decimal(str(amount)) * MONEY_SCALE).quantize(Decimal(1), rounding=ROUND_HALF_EVEN))
+
+
+def from_minor(minor):
+    """Integer paisa -> PKR for display"""
+    return minor / MONEY_SCALE
+
+
+def to_units(qty):
+    """Quantity -> integer units of 1e-8"""
+    return int((Decimal(str(qty)) * QTY_SCALE).quantize(Decimal(1), rounding=ROUND_HALF_EVEN))
+
+
+def from_units(units):
+    """Integer units -> quantity, kept as an int when it is a whole number"""
+    whole, frac = divmod(int(units), QTY_SCALE)
+    return whole if frac == 0 else units / QTY_SCALE
+
+
+def notional(units, price):
+    """Value of `units` at `price` PKR, in paisa"""
+    return int(np.rint(units * price * _UNIT_FACTOR))
+
+
+def notional_array(units, prices):
+    """Vectorized notional() - int64 paisa, safe to sum exactly"""
+    units = np.asarray(units, dtype=np.int64)
+    return np.rint(units * np.asarray(prices, dtype=np.float64) * _UNIT_FACTOR).astype(np.int64)
+
+
+def split_cost(cost, units, take):
+    """Cost of `take` units out of a lot, so that the two parts always add back to `cost`"""
+    if take == units:
+        return cost
+    return cost * take // units
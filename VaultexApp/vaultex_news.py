@@ -0,0 +1,315 @@
+"""Vaultex news archive - every fetched headline, searchable by keyword and ticker
+
+Headlines are appended to a JSON-lines log and indexed in memory: an inverted index maps
+each word (and each ticker) to a sorted array of document ids, so a query intersects a few
+postings arrays instead of scanning the archive. Syndicated copies are collapsed on insert
+with MinHash over character shingles plus LSH banding - a near-duplicate title is linked
+to the story already stored instead of becoming a new document.
+"""
+import json
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from vaultex_sentiment import entry_id, entry_time
+
+NEWS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vaultex_data", "news")
+
+NUM_HASHES = 64
+BANDS = 16                  # 16 bands x 4 rows: pairs above ~0.5 Jaccard become candidates
+ROWS = NUM_HASHES // BANDS
+SHINGLE = 5                 # characters per shingle
+DUPLICATE_THRESHOLD = 0.7   # estimated Jaccard a candidate needs to count as the same story
+STOPWORDS = {"a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in",
+             "is", "it", "its", "of", "on", "or", "that", "the", "this", "to", "was", "will", "with"}
+
+_PRIME = np.uint64(4294967311)  # first prime above 2^32
+_rng = np.random.default_rng(0x5EED)
+_HASH_A = _rng.integers(1, 1 << 31, NUM_HASHES, dtype=np.uint64)
+_HASH_B = _rng.integers(0, 1 << 31, NUM_HASHES, dtype=np.uint64)
+_BAND_MIX = _rng.integers(1, 1 << 63, ROWS, dtype=np.uint64) | np.uint64(1)
+_BAND_SALT = _rng.integers(0, 1 << 63, BANDS, dtype=np.uint64)
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def index_terms(text):
+    """Distinct searchable words of a title"""
+    return {w for w in _WORD.findall(text.lower()) if w not in STOPWORDS}
+
+
+def minhash(text):
+    """MinHash signature (NUM_HASHES values) of a title's character shingles"""
+    normalized = " ".join(_WORD.findall(text.lower()))
+    if len(normalized) < SHINGLE:
+        normalized = normalized.ljust(SHINGLE)
+    shingles = {normalized[i:i + SHINGLE] for i in range(len(normalized) - SHINGLE + 1)}
+    x = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+    return ((np.outer(x, _HASH_A) + _HASH_B) % _PRIME).min(axis=0)
+
+
+def band_keys(signatures):
+    """One hash per LSH band for each signature row -> (n, BANDS) uint64"""
+    rows = np.asarray(signatures, dtype=np.uint64).reshape(-1, BANDS, ROWS)
+    return (rows * _BAND_MIX).sum(axis=2) ^ _BAND_SALT  # wraps mod 2^64, which is fine for a hash
+
+
+class _Postings:
+    """Growable sorted int32 array of document ids"""
+    __slots__ = ("ids", "n")
+
+    def __init__(self, ids=None):
+        self.ids = np.empty(8, dtype=np.int32) if ids is None else np.asarray(ids, dtype=np.int32)
+        self.n = 0 if ids is None else len(self.ids)
+
+    def add(self, doc):
+        if self.n and self.ids[self.n - 1] >= doc:
+            view = self.ids[:self.n]
+            pos = int(np.searchsorted(view, doc))
+            if view[pos] == doc:
+                return
+            self.ids = np.insert(view, pos, doc)  # an old story linked to a new ticker - rare
+            self.n += 1
+            return
+        if self.n == len(self.ids):
+            self.ids = np.concatenate([self.ids, np.empty(len(self.ids), dtype=np.int32)])
+        self.ids[self.n] = doc
+        self.n += 1
+
+    def view(self):
+        return self.ids[:self.n]
+
+
+def _intersect(arrays):
+    """Intersection of sorted id arrays, smallest first (binary search into the larger ones)"""
+    arrays = sorted(arrays, key=len)
+    result = arrays[0]
+    for other in arrays[1:]:
+        if not len(result) or not len(other):
+            return result[:0]
+        pos = np.minimum(np.searchsorted(other, result), len(other) - 1)
+        result = result[other[pos] == result]
+    return result
+
+
+class NewsArchive:
+    """Append-only headline store with an inverted index and near-duplicate collapsing"""
+
+    def __init__(self, root=NEWS_DIR):
+        self.root = root
+        self.keys, self.titles, self.links, self.symbols, self.copies = [], [], [], [], []
+        self._ts = np.empty(0)
+        self._signatures = np.empty((0, NUM_HASHES), dtype=np.uint64)
+        self._n = 0
+        self._by_key = {}     # entry id (any copy) -> document id
+        self._words = {}      # word -> _Postings
+        self._tickers = {}    # symbol -> _Postings
+        self._bands = {}      # band hash -> [document ids] for stories added since the load
+        self._loaded_bands = (np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int32))
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def _log(self):
+        return os.path.join(self.root, "headlines.jsonl")
+
+    @property
+    def _sig_file(self):
+        return os.path.join(self.root, "minhash.bin")
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def duplicates(self):
+        """Syndicated copies collapsed into an existing story"""
+        return sum(self.copies) - self._n
+
+    def _load(self):
+        """Rebuild the in-memory index from the log in bulk (postings built once per term)"""
+        if not os.path.exists(self._log):
+            return
+        with open(self._log) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        docs = [r for r in records if "title" in r]
+        n = len(docs)
+        if n == 0:
+            return
+        stored = np.fromfile(self._sig_file, dtype=np.uint64) if os.path.exists(self._sig_file) else np.empty(0, np.uint64)
+        stored = stored[:len(stored) // NUM_HASHES * NUM_HASHES].reshape(-1, NUM_HASHES)[:n]
+        missing = [minhash(r["title"]) for r in docs[len(stored):]]  # interrupted write
+        signatures = np.concatenate([stored, np.asarray(missing, dtype=np.uint64).reshape(-1, NUM_HASHES)])
+        if len(stored) != n:
+            signatures.tofile(self._sig_file)
+
+        self._reserve(n)
+        self._signatures[:n] = signatures
+        self._ts[:n] = [r["ts"] for r in docs]
+        self._n = n
+        self.keys = [r["key"] for r in docs]
+        self.titles = [r["title"] for r in docs]
+        self.links = [r["link"] for r in docs]
+        self.symbols = [{r["symbol"]} for r in docs]
+        self.copies = [1] * n
+        self._by_key = dict(zip(self.keys, range(n)))
+
+        words, tickers = {}, {}
+        for doc, title in enumerate(self.titles):
+            for word in index_terms(title):
+                ids = words.get(word)
+                if ids is None:
+                    words[word] = [doc]
+                else:
+                    ids.append(doc)
+        for doc, r in enumerate(docs):
+            tickers.setdefault(r["symbol"], []).append(doc)
+        self._words = {word: _Postings(ids) for word, ids in words.items()}
+        self._tickers = {symbol: _Postings(ids) for symbol, ids in tickers.items()}
+
+        # LSH buckets of the loaded stories: band hashes sorted once, looked up by binary search
+        flat = band_keys(signatures).ravel()
+        order = np.argsort(flat, kind="stable")
+        self._loaded_bands = (flat[order], (order // BANDS).astype(np.int32))
+
+        for r in records:
+            if "title" not in r and r["doc"] in self._by_key:
+                self._link(r["key"], self._by_key[r["doc"]], r["symbol"])
+
+    def _reserve(self, size):
+        capacity = len(self._ts)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, 1024)
+        self._ts = np.concatenate([self._ts, np.zeros(capacity - len(self._ts))])
+        self._signatures = np.concatenate([self._signatures, np.zeros((capacity - len(self._signatures), NUM_HASHES), dtype=np.uint64)])
+
+    def _find_duplicate(self, signature):
+        keys = band_keys(signature)[0]
+        sorted_keys, owners = self._loaded_bands
+        lo, hi = np.searchsorted(sorted_keys, keys, "left"), np.searchsorted(sorted_keys, keys, "right")
+        candidates = {int(owners[i]) for a, b in zip(lo.tolist(), hi.tolist()) for i in range(a, b)}
+        for key in keys.tolist():
+            candidates.update(self._bands.get(key, ()))
+        best, best_similarity = None, DUPLICATE_THRESHOLD
+        for doc in candidates:
+            similarity = float(np.mean(self._signatures[doc] == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = doc, similarity
+        return best
+
+    def _insert(self, key, title, link, ts, symbol, signature):
+        doc = self._n
+        self._reserve(doc + 1)
+        self._ts[doc] = ts
+        self._signatures[doc] = signature
+        self.keys.append(key)
+        self.titles.append(title)
+        self.links.append(link)
+        self.symbols.append({symbol})
+        self.copies.append(1)
+        self._n += 1
+        self._by_key[key] = doc
+        for word in index_terms(title):
+            self._postings(self._words, word).add(doc)
+        self._postings(self._tickers, symbol).add(doc)
+        for key in band_keys(signature)[0].tolist():
+            self._bands.setdefault(key, []).append(doc)
+        return doc
+
+    @staticmethod
+    def _postings(index, term):
+        postings = index.get(term)
+        if postings is None:
+            postings = index[term] = _Postings()
+        return postings
+
+    def _link(self, key, doc, symbol):
+        """Attach another copy / another ticker to an existing story; True if anything changed"""
+        changed = False
+        if key not in self._by_key:
+            self._by_key[key] = doc
+            self.copies[doc] += 1
+            changed = True
+        if symbol not in self.symbols[doc]:
+            self.symbols[doc].add(symbol)
+            self._postings(self._tickers, symbol).add(doc)
+            changed = True
+        return changed
+
+    def add(self, symbol, entries):
+        """Archive feed entries fetched for `symbol`
+
+        Returns the entries with syndicated copies collapsed - the first entry of each story,
+        in feed order.
+        """
+        symbol = symbol.upper()
+        unique, seen, records, signatures = [], set(), [], []
+        with self._lock:
+            for entry in entries:
+                key, title = entry_id(entry), entry.get("title") or ""
+                if not key or not title:
+                    continue
+                doc = self._by_key.get(key)
+                if doc is None:
+                    signature = minhash(title)
+                    doc = self._find_duplicate(signature)
+                    if doc is None:
+                        ts = entry_time(entry)
+                        doc = self._insert(key, title, entry.get("link") or "", ts, symbol, signature)
+                        records.append({"key": key, "title": title, "link": self.links[doc], "ts": ts, "symbol": symbol})
+                        signatures.append(signature)
+                    elif self._link(key, doc, symbol):
+                        records.append({"key": key, "doc": self.keys[doc], "symbol": symbol})
+                elif self._link(key, doc, symbol):
+                    records.append({"key": key, "doc": self.keys[doc], "symbol": symbol})
+                if doc not in seen:
+                    seen.add(doc)
+                    unique.append(entry)
+            if records:
+                os.makedirs(self.root, exist_ok=True)
+                if signatures:
+                    with open(self._sig_file, "ab") as f:
+                        f.write(np.asarray(signatures, dtype=np.uint64).tobytes())
+                with open(self._log, "a") as f:
+                    f.writelines(json.dumps(r) + "\n" for r in records)
+        return unique
+
+    def search(self, query="", symbol=None, limit=50):
+        """Newest stories matching every word of `query` (and `$TICKER` terms / `symbol`)
+
+        Returns a DataFrame with Published, Title, Symbols, Copies and Link.
+        """
+        words, tickers = set(), {symbol.upper()} if symbol else set()
+        for term in query.split():
+            if term.startswith("$") and len(term) > 1:
+                tickers.add(term[1:].upper())
+            else:
+                words |= index_terms(term)
+        with self._lock:
+            lists = []
+            for word in words:
+                postings = self._words.get(word)
+                lists.append(postings.view() if postings else np.empty(0, dtype=np.int32))
+            for ticker in tickers:
+                postings = self._tickers.get(ticker)
+                lists.append(postings.view() if postings else np.empty(0, dtype=np.int32))
+            ids = _intersect(lists) if lists else np.arange(self._n, dtype=np.int32)
+            matches = len(ids)
+            ts = self._ts[ids]
+            if len(ids) > limit:
+                top = np.argpartition(-ts, limit - 1)[:limit]
+                ids, ts = ids[top], ts[top]
+            order = np.argsort(-ts, kind="stable")
+            ids, ts = ids[order], ts[order]
+            frame = pd.DataFrame({
+                "Published": pd.to_datetime(ts, unit="s", utc=True),
+                "Title": [self.titles[i] for i in ids],
+                "Symbols": [", ".join(sorted(self.symbols[i])) for i in ids],
+                "Copies": [self.copies[i] for i in ids],
+                "Link": [self.links[i] for i in ids],
+            })
+        frame.attrs["matches"] = matches
+        return frame
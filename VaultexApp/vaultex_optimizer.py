@@ -0,0 +1,128 @@
+"""Vaultex optimizer - long-only mean-variance weights, efficient frontier and rebalance orders
+
+Every frontier point is the solution of  min w'Cw - g * mu'w  over the capped simplex
+(0 <= w <= max_weight, sum w = 1) for one risk-aversion trade-off g. All points are solved
+together by accelerated projected gradient, so a 50-asset frontier is a few hundred
+matrix products rather than one solver call per point.
+"""
+import numpy as np
+import pandas as pd
+
+from vaultex_execution import trades_whole_units
+from vaultex_money import QTY_SCALE
+
+TRADING_DAYS = 252
+
+
+def project_capped_simplex(v, cap):
+    """Euclidean projection of each row of `v` onto {0 <= w <= cap, sum w = 1}
+
+    sum(clip(v - tau, 0, cap)) is piecewise linear in tau with breakpoints at v and v - cap,
+    so the exact shift is found by evaluating it at every breakpoint and interpolating.
+    """
+    breaks = np.sort(np.concatenate([v, v - cap], axis=1), axis=1)
+    total = np.clip(v[:, None, :] - breaks[:, :, None], 0.0, cap).sum(axis=2)  # decreasing in tau
+    k = np.clip((total >= 1).sum(axis=1) - 1, 0, breaks.shape[1] - 2)
+    rows = np.arange(len(v))
+    t0, t1 = breaks[rows, k], breaks[rows, k + 1]
+    s0, s1 = total[rows, k], total[rows, k + 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tau = np.where(s0 != s1, t0 + (s0 - 1) * (t1 - t0) / (s0 - s1), t0)
+    return np.clip(v - tau[:, None], 0.0, cap)
+
+
+def efficient_frontier(mu, cov, max_weight=1.0, points=40, iterations=500, tol=1e-7):
+    """Solve the frontier; returns (weights[points, n], expected return[points], volatility[points])
+
+    `mu` and `cov` are per-period; the first point is the minimum-variance portfolio.
+    """
+    mu = np.asarray(mu, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    n = len(mu)
+    if n == 0:
+        raise ValueError("NO ASSETS")
+    cap = min(float(max_weight), 1.0)
+    if cap * n < 1 - 1e-12:
+        raise ValueError(f"MAX WEIGHT {cap:.0%} IS TOO LOW FOR {n} ASSETS")
+
+    lipschitz = 2 * max(np.linalg.eigvalsh(cov)[-1], 1e-18)
+    spread = max(np.abs(mu).max(), 1e-18)
+    gamma = np.concatenate([[0.0], np.geomspace(1e-3, 1e2, points - 1)]) * lipschitz / spread
+
+    w = project_capped_simplex(np.full((points, n), 1.0 / n), cap)
+    y, t = w, np.ones((points, 1))
+    for _ in range(iterations):
+        grad = 2 * y @ cov - gamma[:, None] * mu
+        w_next = project_capped_simplex(y - grad / lipschitz, cap)
+        step = w_next - w
+        # Momentum restart per point once it starts pointing uphill
+        t = np.where(((y - w_next) * step).sum(axis=1, keepdims=True) > 0, 1.0, t)
+        t_next = (1 + np.sqrt(1 + 4 * t * t)) / 2
+        y = w_next + (t - 1) / t_next * step
+        w, t = w_next, t_next
+        if np.abs(step).max() < tol:
+            break
+
+    returns = w @ mu
+    vol = np.sqrt(np.maximum(np.einsum("ij,jk,ik->i", w, cov, w), 0.0))
+    return w, returns, vol
+
+
+def optimize(closes, max_weight=1.0, window=TRADING_DAYS, risk_free=0.0, points=40, cov=None):
+    """Frontier and the min-variance / max-Sharpe portfolios for an aligned daily close frame
+
+    `cov` (per-bar, e.g. from CorrelationMatrix) is reused when given. Returns a dict with
+    `frontier` (annualized Return / Volatility / Sharpe per point), `min_variance` and
+    `max_sharpe` weight Series.
+    """
+    closes = closes.dropna(axis=1, how="all")
+    symbols = list(closes.columns)
+    prices = closes.to_numpy(dtype=float)[-(window + 1):]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.nan_to_num(np.diff(np.log(prices), axis=0))
+    mu = returns.mean(axis=0)
+    if cov is None:
+        centered = returns - mu
+        cov = centered.T @ centered / max(len(returns) - 1, 1)
+    else:
+        cov = pd.DataFrame(cov).loc[symbols, symbols].to_numpy(dtype=float)
+
+    weights, ret, vol = efficient_frontier(mu, cov, max_weight=max_weight, points=points)
+    ret, vol = ret * TRADING_DAYS, vol * np.sqrt(TRADING_DAYS)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(vol > 0, (ret - risk_free) / vol, np.nan)
+    best = int(np.nanargmax(sharpe)) if np.isfinite(sharpe).any() else 0
+    return {
+        "frontier": pd.DataFrame({"Return": ret * 100, "Volatility": vol * 100, "Sharpe": sharpe}),
+        "weights": pd.DataFrame(weights, columns=symbols),
+        "min_variance": pd.Series(weights[0], index=symbols),
+        "max_sharpe": pd.Series(weights[best], index=symbols),
+    }
+
+
+def rebalance_orders(target, prices, holdings, equity, min_trade=1, min_value=1.0):
+    """Basket rows that move `holdings` towards `target` weights of `equity` PKR
+
+    Share-like symbols trade whole units, at least `min_trade` of them. Fractional ones
+    (crypto, FX) are rounded down to the ledger's 1e-8 unit and skipped below `min_value` PKR.
+    """
+    symbols = sorted(set(target.index) | set(holdings))
+    weight = pd.Series(target, dtype=float).reindex(symbols).fillna(0.0)
+    price = pd.Series(prices, dtype=float).reindex(symbols)
+    held = pd.Series(holdings, dtype=float).reindex(symbols).fillna(0.0)
+    whole = np.array([trades_whole_units(s) for s in symbols], dtype=bool)
+    step = np.where(whole, 1.0, 1 / QTY_SCALE)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        units = np.floor(np.round(weight * equity / price / step, 6)) * step
+        wanted = np.where(price > 0, units, held)
+        delta = wanted - held
+        trade = np.where(whole, np.abs(delta) >= min_trade, np.abs(delta) * price >= min_value)
+    orders = pd.DataFrame({
+        "Symbol": np.asarray(symbols)[trade],
+        "Side": np.where(delta[trade] > 0, "BUY", "SELL"),
+        "Quantity": np.abs(delta[trade]),
+        "Type": "MARKET",
+        "Limit Price": np.nan,
+    })
+    # Sells listed first, the way a rebalance reads
+    return orders.sort_values("Side", ascending=False, kind="stable").reset_index(drop=True)
@@ -0,0 +1,137 @@
+"""Vaultex options - Black-Scholes pricing, implied volatility and greeks for a whole chain
+
+Everything takes arrays (one element per contract), so a chain of a few hundred strikes is
+priced, inverted to IV and differentiated in a handful of NumPy passes.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+CONTRACT_SIZE = 100          # shares per listed equity option
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+MIN_TIME = 1 / (365.25 * 24)  # one hour - keeps expiring contracts finite
+_SQRT_2PI = np.sqrt(2 * np.pi)
+_CONTRACT = re.compile(r"^[A-Z0-9.^-]{1,10}\d{6}[CP]\d{8}$")   # root, YYMMDD, C/P, strike x 1000
+
+
+def is_contract(symbol):
+    """True for an option contract symbol such as AAPL250117C00150000 (no OHLCV bars on Yahoo)"""
+    return bool(_CONTRACT.match(str(symbol).upper()))
+
+
+def _erf(x):
+    """Abramowitz & Stegun 7.1.26 (|error| < 1.5e-7), vectorized"""
+    sign = np.sign(x)
+    x = np.abs(x)
+    t = 1 / (1 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    return sign * (1 - poly * np.exp(-x * x))
+
+
+def norm_cdf(x):
+    return 0.5 * (1 + _erf(np.asarray(x, dtype=float) / np.sqrt(2)))
+
+
+def norm_pdf(x):
+    return np.exp(-0.5 * np.square(x)) / _SQRT_2PI
+
+
+def _d1_d2(spot, strike, t, rate, sigma):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vol_t = sigma * np.sqrt(t)
+        d1 = (np.log(spot / strike) + (rate + 0.5 * sigma * sigma) * t) / vol_t
+    return d1, d1 - vol_t
+
+
+def bs_price(spot, strike, t, rate, sigma, is_call):
+    """Black-Scholes premium per share"""
+    d1, d2 = _d1_d2(spot, strike, t, rate, sigma)
+    discount = strike * np.exp(-rate * t)
+    call = spot * norm_cdf(d1) - discount * norm_cdf(d2)
+    put = discount * norm_cdf(-d2) - spot * norm_cdf(-d1)
+    return np.where(is_call, call, put)
+
+
+def greeks(spot, strike, t, rate, sigma, is_call):
+    """Delta, gamma, theta (per calendar day) and vega (per 1 vol point) -> dict of arrays"""
+    d1, d2 = _d1_d2(spot, strike, t, rate, sigma)
+    pdf = norm_pdf(d1)
+    sqrt_t = np.sqrt(t)
+    discount = strike * np.exp(-rate * t)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = pdf / (spot * sigma * sqrt_t)
+        decay = -spot * pdf * sigma / (2 * sqrt_t)
+    theta_call = decay - rate * discount * norm_cdf(d2)
+    theta_put = decay + rate * discount * norm_cdf(-d2)
+    return {
+        "Delta": np.where(is_call, norm_cdf(d1), norm_cdf(d1) - 1),
+        "Gamma": gamma,
+        "Theta": np.where(is_call, theta_call, theta_put) / 365.25,
+        "Vega": spot * pdf * sqrt_t / 100,
+    }
+
+
+def implied_vol(price, spot, strike, t, rate, is_call, iterations=60, tol=1e-6):
+    """Vectorized IV: Newton steps, falling back to bisection whenever Newton leaves the bracket
+
+    Contracts priced outside the no-arbitrage bounds come back as NaN.
+    """
+    price, spot, strike, t = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in (price, spot, strike, t)])
+    is_call = np.broadcast_to(is_call, price.shape)
+    discount = strike * np.exp(-rate * t)
+    lower = np.where(is_call, np.maximum(spot - discount, 0), np.maximum(discount - spot, 0))
+    upper = np.where(is_call, spot, discount)
+    valid = (price > lower) & (price < upper) & (t > 0)
+
+    lo = np.full(price.shape, 1e-4)
+    hi = np.full(price.shape, 5.0)
+    sigma = np.full(price.shape, 0.3)
+    for _ in range(iterations):
+        diff = bs_price(spot, strike, t, rate, sigma, is_call) - price
+        if np.all(np.abs(diff[valid]) < tol):
+            break
+        # The premium rises with sigma, so the sign of the error tightens the bracket
+        hi = np.where(diff > 0, sigma, hi)
+        lo = np.where(diff <= 0, sigma, lo)
+        d1, _ = _d1_d2(spot, strike, t, rate, sigma)
+        vega = spot * norm_pdf(d1) * np.sqrt(t)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = sigma - diff / vega
+        sigma = np.where((vega > 1e-8) & (newton > lo) & (newton < hi), newton, (lo + hi) / 2)
+    return np.where(valid, sigma, np.nan)
+
+
+def years_to_expiry(expiry, now=None):
+    """Years from now to 16:00 New York on the expiry date"""
+    close = pd.Timestamp(expiry).tz_localize("America/New_York") + pd.Timedelta(hours=16)
+    now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+    return max((close - now).total_seconds() / SECONDS_PER_YEAR, MIN_TIME)
+
+
+def quote_price(chain):
+    """Mid when both sides are quoted, otherwise the last trade"""
+    bid, ask = chain["bid"].fillna(0), chain["ask"].fillna(0)
+    return np.where((bid > 0) & (ask > 0), (bid + ask) / 2, chain["lastPrice"].fillna(0))
+
+
+def analyze_chain(calls, puts, spot, t, rate):
+    """IV and greeks for both sides of one expiry in one pass -> DataFrame (one row per contract)"""
+    chain = pd.concat([calls.assign(Type="CALL"), puts.assign(Type="PUT")], ignore_index=True)
+    is_call = (chain["Type"] == "CALL").to_numpy()
+    strike = chain["strike"].to_numpy(dtype=float)
+    price = quote_price(chain)
+    iv = implied_vol(price, spot, strike, t, rate, is_call)
+    g = greeks(spot, strike, t, rate, iv, is_call)
+    return pd.DataFrame({
+        "Contract": chain["contractSymbol"],
+        "Type": chain["Type"],
+        "Strike": strike,
+        "Bid": chain["bid"].to_numpy(dtype=float),
+        "Ask": chain["ask"].to_numpy(dtype=float),
+        "Mid": price,
+        "Volume": chain["volume"].to_numpy(dtype=float),
+        "Open Int": chain["openInterest"].to_numpy(dtype=float),
+        "IV %": iv * 100,
+        **g,
+    })
@@ -0,0 +1,110 @@
+"""Vaultex patterns - classic candlestick patterns as boolean array logic over OHLC
+
+Every pattern is a handful of element-wise comparisons on body / shadow arrays and their
+one- or two-bar lags, so a whole series (or the trailing window after a new bar) is
+classified in a few NumPy passes. Results are cached per (symbol, interval, window); an
+update only re-evaluates the revised last bar and the bars appended since.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+DOJI_BODY = 0.1        # body <= 10% of the bar's range
+SHADOW_RATIO = 2.0     # hammer: lower shadow >= 2x body
+LONG_BODY = 0.6        # star pattern's first bar: body >= 60% of its range
+STAR_BODY = 0.3        # star pattern's middle bar: body <= 30% of the first bar's body
+LOOKBACK = 3           # most bars any pattern looks at
+_OHLC = ("Open", "High", "Low", "Close")
+
+# name -> bias; bullish patterns are marked under the bar, bearish ones above
+PATTERNS = {
+    "Doji": "neutral",
+    "Hammer": "bullish",
+    "Bullish Engulfing": "bullish",
+    "Bearish Engulfing": "bearish",
+    "Morning Star": "bullish",
+    "Evening Star": "bearish",
+    "Inside Bar": "neutral",
+}
+
+
+def _lag(x, k):
+    out = np.full_like(x, np.nan)
+    out[k:] = x[:-k]
+    return out
+
+
+def detect(open_, high, low, close):
+    """Boolean array per pattern for OHLC arrays (a bar is flagged on the pattern's last bar)"""
+    o, h, l, c = (np.asarray(a, dtype=float) for a in (open_, high, low, close))
+    body = np.abs(c - o)
+    span = h - l
+    top, bottom = np.maximum(o, c), np.minimum(o, c)
+    upper, lower = h - top, bottom - l
+    up, down = c > o, c < o
+
+    o1, h1, l1, c1 = (_lag(a, 1) for a in (o, h, l, c))
+    o2, l2, c2, h2 = (_lag(a, 2) for a in (o, l, c, h))
+    body1, body2 = np.abs(c1 - o1), np.abs(c2 - o2)
+    with np.errstate(invalid="ignore"):
+        mid2 = (o2 + c2) / 2
+        star = (body1 <= STAR_BODY * body2) & (body2 >= LONG_BODY * (h2 - l2))
+        return {
+            "Doji": (span > 0) & (body <= DOJI_BODY * span),
+            "Hammer": (span > 0) & (body > DOJI_BODY * span) & (lower >= SHADOW_RATIO * body) & (upper <= body),
+            "Bullish Engulfing": up & (c1 < o1) & (o <= c1) & (c >= o1) & (body > body1),
+            "Bearish Engulfing": down & (c1 > o1) & (o >= c1) & (c <= o1) & (body > body1),
+            "Morning Star": (c2 < o2) & star & up & (c > mid2) & (np.maximum(o1, c1) < o2),
+            "Evening Star": (c2 > o2) & star & down & (c < mid2) & (np.minimum(o1, c1) > o2),
+            "Inside Bar": (h < h1) & (l > l1),
+        }
+
+
+def detect_frame(bars):
+    """Pattern flags for an OHLCV frame -> bool DataFrame aligned to `bars`"""
+    return pd.DataFrame(detect(*(bars[col] for col in _OHLC)), index=bars.index)
+
+
+class PatternScanner:
+    """Cached pattern flags per (symbol, interval, window), extended incrementally as bars arrive
+
+    `window` names the span the caller passes (a chart period, the scan's lookback), so two
+    views of one series with different starts don't keep throwing each other's state away.
+    """
+
+    def __init__(self):
+        self._state = {}   # (symbol, interval, window) -> (int64 bar times, {pattern: bool array})
+        self._lock = threading.Lock()
+
+    def update(self, bars, symbol, interval, window=None):
+        """Pattern flags for `bars` (bool DataFrame), reusing the cached prefix when it still matches"""
+        times = pd.DatetimeIndex(bars.index).as_unit("ns").asi8
+        key = (symbol, interval, window)
+        with self._lock:
+            cached = self._state.get(key)
+            n = len(cached[0]) if cached else 0
+            if n and len(times) >= n and times[0] == cached[0][0] and times[n - 1] == cached[0][n - 1]:
+                # Revised last bar + new bars, with enough history for the three-bar patterns
+                start = max(n - 1 - (LOOKBACK - 1), 0)
+                tail = detect(*(bars[col].to_numpy(dtype=float)[start:] for col in _OHLC))
+                skip = n - 1 - start
+                flags = {name: np.concatenate([cached[1][name][:n - 1], tail[name][skip:]]) for name in PATTERNS}
+            else:
+                flags = detect(*(bars[col].to_numpy(dtype=float) for col in _OHLC))
+            self._state[key] = (times, flags)
+        return pd.DataFrame(flags, index=bars.index)
+
+    def scan(self, universe, interval, within=1, window=None):
+        """Patterns that fired in the last `within` bars of each symbol's bars -> DataFrame"""
+        rows = []
+        for symbol, bars in universe.items():
+            if len(bars) < LOOKBACK:
+                continue
+            recent = self.update(bars, symbol, interval, window).iloc[-within:]
+            for name in PATTERNS:
+                hits = recent.index[recent[name].to_numpy()]
+                if len(hits):
+                    rows.append({"Symbol": symbol, "Pattern": name, "Bias": PATTERNS[name].upper(),
+                                 "Bar": hits[-1], "Close": float(bars["Close"].loc[hits[-1]])})
+        return pd.DataFrame(rows, columns=["Symbol", "Pattern", "Bias", "Bar", "Close"])
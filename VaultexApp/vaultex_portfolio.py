@@ -0,0 +1,183 @@
+"""Vaultex portfolio history - NAV equity curve rebuilt from the trade journal and cached bars"""
+import numpy as np
+import pandas as pd
+
+from vaultex_money import MONEY_SCALE, QTY_SCALE
+
+
+def align_closes(bars, daily=False):
+    """Outer-join the Close column of several bar frames onto one forward-filled time index
+
+    With `daily`, every index is reduced to its own calendar date first, so daily bars
+    stamped at exchange-local midnight and tz-naive daily bars land on the same row.
+    """
+    if not bars:
+        return pd.DataFrame()
+    series = {}
+    for symbol, df in bars.items():
+        close = df['Close']
+        index = pd.DatetimeIndex(close.index)
+        if daily:
+            index = (index if index.tz is None else index.tz_localize(None)).normalize().tz_localize("UTC")
+            close = close[~index.duplicated(keep="last")]
+            index = index[~index.duplicated(keep="last")]
+        series[symbol] = close.set_axis(index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC"))
+    closes = pd.concat(series, axis=1).sort_index()
+    return closes.ffill()
+
+
+def rebase(closes, base=100.0):
+    """Scale every column so its first valid value equals `base`"""
+    first = closes.bfill().iloc[0] if len(closes) else closes.iloc[0:0]
+    return closes.div(first.where(first != 0)) * base
+
+
+class EquityCurve:
+    """NAV per bar for one account
+
+    Journal rows are (timestamp seconds, symbol or None, signed units, cash change in paisa),
+    in time order. The full build is one aligned-matrix pass. Afterwards the positions and cash
+    at the end of the second-to-last bar are carried, so new bars (and fills after the last
+    bar) only recompute the tail.
+    """
+
+    def __init__(self):
+        self.symbols = ()
+        self.times = np.zeros(0, dtype=np.int64)
+        self.journal_len = 0
+        self._journal_ends = None  # (first, last) journal row folded - a reset or another account differs
+        self.nav = np.zeros(0)
+        self._carry_units = np.zeros(0, dtype=np.int64)
+        self._carry_cash = 0
+        self._carry_split = 0  # journal rows already folded into the carry
+
+    def _paths(self, times, closes, journal, when, units, cash):
+        """Positions, cash and NAV per bar, starting from `units`/`cash` and applying journal rows"""
+        t = len(times)
+        col = {s: i for i, s in enumerate(self.symbols)}
+        delta_units = np.zeros((t, len(self.symbols)), dtype=np.int64)
+        delta_cash = np.zeros(t, dtype=np.int64)
+        if journal:
+            _, syms, du, dc = zip(*journal)
+            bar = np.clip(np.searchsorted(times, when, side="right") - 1, 0, t - 1)
+            delta_cash += np.bincount(bar, weights=dc, minlength=t).astype(np.int64)
+            traded = np.array([s is not None for s in syms])
+            if traded.any():
+                cols = np.array([col[s] for s in np.asarray(syms, dtype=object)[traded]])
+                np.add.at(delta_units, (bar[traded], cols), np.asarray(du, dtype=np.int64)[traded])
+        units_path = units + np.cumsum(delta_units, axis=0)
+        cash_path = cash + np.cumsum(delta_cash)
+        nav = cash_path + (units_path * np.nan_to_num(closes) * (MONEY_SCALE / QTY_SCALE)).sum(axis=1)
+        return units_path, cash_path, nav
+
+    def update(self, journal, closes):
+        """Bring the curve up to date; returns a DataFrame with NAV and drawdown per bar"""
+        if closes.empty or not journal:
+            return pd.DataFrame(columns=["NAV", "Drawdown"])
+        symbols = tuple(sorted({row[1] for row in journal if row[1] is not None}))
+        closes = closes.reindex(columns=list(symbols))
+        times = pd.DatetimeIndex(closes.index).tz_convert("UTC").as_unit("ns").asi8
+        when = pd.to_datetime(np.array([row[0] for row in journal], dtype=float), unit="s", utc=True).as_unit("ns").asi8
+
+        old = len(self.times)
+        incremental = (
+            old > 0
+            and symbols == self.symbols
+            and len(times) >= old
+            and np.array_equal(times[:old], self.times)
+            and len(journal) >= self.journal_len
+            and (journal[0], journal[self.journal_len - 1]) == self._journal_ends
+            and (len(journal) == self.journal_len or when[self.journal_len:].min() >= self.times[-1])
+        )
+        if incremental:
+            start, split = old - 1, self._carry_split
+            units, cash = self._carry_units, self._carry_cash
+        else:
+            self.symbols = symbols
+            start, split = 0, 0
+            units, cash = np.zeros(len(symbols), dtype=np.int64), 0
+
+        units_path, cash_path, nav = self._paths(
+            times[start:], closes.to_numpy()[start:], journal[split:], when[split:], units, cash
+        )
+        self.nav = np.concatenate([self.nav[:start], nav]) if incremental else nav
+        if len(nav) >= 2:
+            self._carry_units, self._carry_cash = units_path[-2], int(cash_path[-2])
+            self._carry_split = int(np.searchsorted(when, times[-1], side="left"))
+        else:
+            self._carry_units, self._carry_cash, self._carry_split = units, cash, split
+        self.times, self.journal_len = times, len(journal)
+        self._journal_ends = (journal[0], journal[-1])
+
+        nav = self.nav / MONEY_SCALE
+        peak = np.maximum.accumulate(nav)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = np.where(peak > 0, nav / peak - 1, 0.0) * 100
+        return pd.DataFrame({"NAV": nav, "Drawdown": drawdown}, index=closes.index)
+
+
+class CorrelationMatrix:
+    """Covariance and correlation of bar returns over a trailing window
+
+    Results are cached by (symbol set, window, last bar). When the symbol set changes but
+    most columns of the return matrix are identical to the previous run for that window,
+    only the rows and columns of the changed symbols are recomputed.
+    """
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._cache = {}  # (symbols, window, last bar) -> (cov, corr) DataFrames
+        self._last = {}   # window -> (symbols, centered returns, cov) of the latest run
+
+    def compute(self, closes, window):
+        """Return (cov, corr) DataFrames for the columns of an aligned close frame"""
+        closes = closes.dropna(axis=1, how="all")
+        symbols = tuple(closes.columns)
+        if closes.empty or len(closes) < 3:
+            empty = pd.DataFrame(index=list(symbols), columns=list(symbols), dtype=float)
+            return empty, empty
+        key = (frozenset(symbols), window, closes.index[-1])
+        if key in self._cache:
+            cov, corr = self._cache[key]
+            return cov.loc[list(symbols), list(symbols)], corr.loc[list(symbols), list(symbols)]
+
+        prices = closes.to_numpy(dtype=float)[-(window + 1):]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = np.nan_to_num(np.diff(np.log(prices), axis=0))
+        centered = returns - returns.mean(axis=0)
+        cov = self._covariance(symbols, window, centered)
+
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = np.where(np.outer(std, std) > 0, cov / np.outer(std, std), np.nan)
+        np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+
+        result = (pd.DataFrame(cov, index=list(symbols), columns=list(symbols)),
+                  pd.DataFrame(corr, index=list(symbols), columns=list(symbols)))
+        self._last[window] = (symbols, centered, cov)
+        if len(self._cache) >= self.max_entries:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = result
+        return result
+
+    def _covariance(self, symbols, window, centered):
+        """Full X'X / (T-1), or only the changed rows/columns when the previous run allows it"""
+        scale = max(len(centered) - 1, 1)
+        previous = self._last.get(window)
+        if previous is not None and previous[1].shape[0] == centered.shape[0]:
+            old_symbols, old_centered, old_cov = previous
+            old_col = {s: i for i, s in enumerate(old_symbols)}
+            same = np.array([s in old_col and np.array_equal(centered[:, i], old_centered[:, old_col[s]])
+                             for i, s in enumerate(symbols)])
+            if same.any():
+                keep = np.flatnonzero(same)
+                changed = np.flatnonzero(~same)
+                source = np.array([old_col[symbols[i]] for i in keep])
+                cov = np.empty((len(symbols), len(symbols)))
+                cov[np.ix_(keep, keep)] = old_cov[np.ix_(source, source)]
+                if len(changed):
+                    block = centered[:, changed].T @ centered / scale
+                    cov[changed, :] = block
+                    cov[:, changed] = block.T
+                return cov
+        return centered.T @ centered / scale
@@ -0,0 +1,100 @@
+"""Vaultex seasonality - return, volatility and volume by hour of day and day of week
+
+Intraday bars are folded into running sums per (weekday, hour) cell - count, sum of log
+returns, sum of squares and volume - with one bincount pass (a vectorized group-by-sum),
+so every profile is a few divisions over a 7 x 24 grid. Only bars newer than the last
+folded one are added on an update; the last bar is left out until it is complete.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+CELLS = 7 * 24
+MAX_GAP_BARS = 3   # a longer gap (overnight, weekend, halt) starts a new run - no return across it
+_N, _S1, _S2, _VOL, _VOL_N = range(5)
+
+
+class Seasonality:
+    """Running weekday x hour statistics for one symbol's intraday bars"""
+
+    def __init__(self, bar_seconds=300):
+        self.bar_seconds = bar_seconds
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._sums = np.zeros((5, CELLS))
+        self._first = None      # first bar time folded (ns) - a different window forces a rebuild
+        self._last = None       # last bar time folded (ns)
+        self._last_close = np.nan
+        self.bars = 0
+
+    def update(self, bars):
+        """Fold in the completed bars newer than the last update; returns how many were added"""
+        if len(bars) < 2:
+            return 0
+        index = pd.DatetimeIndex(bars.index)
+        times = index.as_unit("ns").asi8
+        with self._lock:
+            if self._first is not None and times[0] != self._first:
+                self._reset()
+            start = 0 if self._last is None else int(np.searchsorted(times, self._last, side="right"))
+            end = len(times) - 1   # the newest bar may still be forming
+            if start >= end:
+                return 0
+            closes = bars["Close"].to_numpy(dtype=float)
+            prev_close = np.concatenate([[self._last_close if start else np.nan], closes[start:end - 1]])
+            prev_time = np.concatenate([[self._last if start else times[0]], times[start:end - 1]])
+            gap_ok = (times[start:end] - prev_time) <= MAX_GAP_BARS * self.bar_seconds * 1_000_000_000
+            with np.errstate(divide="ignore", invalid="ignore"):
+                returns = np.log(closes[start:end] / prev_close)
+            valid = gap_ok & np.isfinite(returns)
+            returns = np.where(valid, returns, 0.0)
+            volume = np.nan_to_num(bars["Volume"].to_numpy(dtype=float)[start:end])
+
+            window = index[start:end]
+            cells = window.dayofweek.to_numpy() * 24 + window.hour.to_numpy()
+            self._sums[_N] += np.bincount(cells, weights=valid, minlength=CELLS)
+            self._sums[_S1] += np.bincount(cells, weights=returns, minlength=CELLS)
+            self._sums[_S2] += np.bincount(cells, weights=returns * returns, minlength=CELLS)
+            self._sums[_VOL] += np.bincount(cells, weights=volume, minlength=CELLS)
+            self._sums[_VOL_N] += np.bincount(cells, minlength=CELLS)
+
+            self._first = times[0] if self._first is None else self._first
+            self._last = times[end - 1]
+            self._last_close = closes[end - 1]
+            self.bars += end - start
+            return end - start
+
+    @staticmethod
+    def _stats(sums, labels):
+        n, s1, s2, vol, vol_n = sums
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(n > 0, s1 / n, np.nan)
+            var = np.where(n > 1, (s2 - s1 * s1 / n) / (n - 1), np.nan)
+            avg_volume = np.where(vol_n > 0, vol / vol_n, np.nan)
+        return pd.DataFrame({
+            "Avg Return %": mean * 100,
+            "Volatility %": np.sqrt(np.maximum(var, 0)) * 100,
+            "Avg Volume": avg_volume,
+            "Bars": vol_n.astype(int),
+        }, index=pd.Index(labels))
+
+    def profile(self, by="hour"):
+        """Per-bar return mean / std (%) and mean volume by "hour" (0-23) or "weekday" (Mon-Sun)"""
+        with self._lock:
+            grid = self._sums.reshape(5, 7, 24)
+            if by == "hour":
+                stats = self._stats(grid.sum(axis=1), [f"{h:02d}:00" for h in range(24)])
+            else:
+                stats = self._stats(grid.sum(axis=2), list(WEEKDAYS))
+        return stats[stats["Bars"] > 0]
+
+    def heatmap(self, column="Avg Return %"):
+        """Weekday x hour grid of one profile column (NaN where no bars fell)"""
+        with self._lock:
+            stats = self._stats(self._sums, range(CELLS))
+        grid = np.where(stats["Bars"].to_numpy() > 0, stats[column].to_numpy(dtype=float), np.nan).reshape(7, 24)
+        return pd.DataFrame(grid, index=list(WEEKDAYS), columns=[f"{h:02d}" for h in range(24)])
@@ -0,0 +1,164 @@
+"""Vaultex sentiment - lexicon headline scoring with negation handling, cached per entry id
+
+Headlines are tokenized, looked up in a small finance lexicon and scored in batches; a
+negation word flips the next few sentiment terms and an intensifier scales the next one.
+Each entry id is scored once and shared by every user; per-ticker aggregates are a
+recency-weighted mean of the headlines seen for that symbol.
+"""
+import calendar
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import numpy as np
+import pandas as pd
+
+LEXICON = {
+    # bullish
+    "surge": 3.0, "surges": 3.0, "surged": 3.0, "soar": 3.0, "soars": 3.0, "soared": 3.0,
+    "skyrocket": 3.5, "skyrockets": 3.5, "rally": 2.5, "rallies": 2.5, "rallied": 2.5,
+    "jump": 2.0, "jumps": 2.0, "jumped": 2.0, "climb": 1.5, "climbs": 1.5, "climbed": 1.5,
+    "rise": 1.5, "rises": 1.5, "rising": 1.5, "rose": 1.5, "gain": 1.5, "gains": 1.5, "gained": 1.5,
+    "rebound": 1.5, "rebounds": 1.5, "recover": 1.5, "recovers": 1.5, "recovery": 1.5,
+    "beat": 2.0, "beats": 2.0, "tops": 1.5, "exceed": 2.0, "exceeds": 2.0, "exceeded": 2.0,
+    "record": 1.5, "upgrade": 2.5, "upgrades": 2.5, "upgraded": 2.5, "outperform": 2.0,
+    "outperforms": 2.0, "bullish": 2.5, "buy": 1.0, "strong": 1.5, "stronger": 1.5, "robust": 1.5,
+    "growth": 1.5, "grow": 1.0, "grows": 1.0, "profit": 1.5, "profits": 1.5, "profitable": 2.0,
+    "boost": 2.0, "boosts": 2.0, "boosted": 2.0, "expand": 1.0, "expands": 1.0, "expansion": 1.0,
+    "raise": 1.0, "raises": 1.0, "raised": 1.0, "dividend": 1.0, "buyback": 1.5, "breakthrough": 2.5,
+    "approval": 2.0, "approved": 2.0, "approves": 2.0, "win": 1.5, "wins": 1.5, "won": 1.5,
+    "optimistic": 2.0, "optimism": 2.0, "confident": 1.5, "positive": 1.5, "upbeat": 2.0,
+    "good": 1.5, "better": 1.5, "best": 2.0, "great": 2.0, "high": 0.5, "higher": 1.0, "highs": 1.0,
+    "momentum": 1.0, "opportunity": 1.0, "success": 2.0, "successful": 2.0, "partnership": 1.0,
+    # bearish
+    "fall": -1.5, "falls": -1.5, "fell": -1.5, "falling": -1.5, "drop": -1.5, "drops": -1.5,
+    "dropped": -1.5, "decline": -1.5, "declines": -1.5, "declined": -1.5, "slide": -1.5,
+    "slides": -1.5, "slid": -1.5, "slip": -1.0, "slips": -1.0, "slump": -2.5, "slumps": -2.5,
+    "plunge": -3.0, "plunges": -3.0, "plunged": -3.0, "tumble": -2.5, "tumbles": -2.5,
+    "tumbled": -2.5, "sink": -2.0, "sinks": -2.0, "sank": -2.0, "crash": -3.5, "crashes": -3.5,
+    "selloff": -2.5, "miss": -2.0, "misses": -2.0, "missed": -2.0, "downgrade": -2.5,
+    "downgrades": -2.5, "downgraded": -2.5, "underperform": -2.0, "bearish": -2.5, "sell": -1.0,
+    "weak": -1.5, "weaker": -1.5, "weakness": -1.5, "loss": -1.5, "losses": -1.5, "lose": -1.5,
+    "loses": -1.5, "lost": -1.5, "cut": -1.0, "cuts": -1.0, "layoff": -2.0, "layoffs": -2.0,
+    "lawsuit": -2.0, "sued": -2.0, "probe": -1.5, "investigation": -1.5, "fraud": -3.5,
+    "scandal": -3.0, "recall": -2.0, "recalls": -2.0, "bankruptcy": -3.5, "bankrupt": -3.5,
+    "default": -2.5, "warn": -1.5, "warns": -1.5, "warning": -1.5, "fine": -1.0, "fined": -2.0,
+    "penalty": -2.0, "halt": -1.5, "halts": -1.5, "halted": -1.5, "delay": -1.0, "delays": -1.0,
+    "delayed": -1.0, "concern": -1.0, "concerns": -1.0, "fear": -1.5, "fears": -1.5, "worry": -1.5,
+    "worries": -1.5, "risk": -0.5, "risks": -0.5, "volatile": -0.5, "uncertainty": -1.0,
+    "pessimistic": -2.0, "negative": -1.5, "bad": -1.5, "worse": -1.5, "worst": -2.0,
+    "low": -0.5, "lower": -1.0, "lows": -1.0, "resign": -1.5, "resigns": -1.5, "shortfall": -2.0,
+    "downturn": -2.0, "recession": -2.5, "inflation": -0.5, "struggle": -1.5, "struggles": -1.5,
+}
+NEGATIONS = {"not", "no", "never", "without", "nor", "neither", "isn't", "aren't", "wasn't",
+             "won't", "don't", "doesn't", "didn't", "can't", "cannot", "fails", "failed", "barely"}
+INTENSIFIERS = {"sharply": 1.5, "significantly": 1.3, "strongly": 1.3, "heavily": 1.3, "massive": 1.5,
+                "huge": 1.4, "big": 1.2, "slightly": 0.6, "modestly": 0.7, "marginally": 0.6}
+NEGATION_SCOPE = 3     # tokens a negation reaches forward
+NEGATION_FACTOR = -0.74
+NORMALIZE_ALPHA = 15   # score = s / sqrt(s^2 + alpha), so it stays in (-1, 1)
+HALF_LIFE_HOURS = 24
+NEUTRAL_BAND = 0.05
+
+_TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower().replace("sell-off", "selloff").replace("n’t", "n't"))
+
+
+def _raw_score(tokens):
+    total, negate_until, boost = 0.0, -1, 1.0
+    for i, token in enumerate(tokens):
+        if token in NEGATIONS:
+            negate_until = i + NEGATION_SCOPE
+            continue
+        if token in INTENSIFIERS:
+            boost = INTENSIFIERS[token]
+            continue
+        weight = LEXICON.get(token)
+        if weight is None:
+            continue
+        weight *= boost
+        boost = 1.0
+        total += weight * NEGATION_FACTOR if i <= negate_until else weight
+    return total
+
+
+def score_batch(texts):
+    """Normalized sentiment in (-1, 1) for each text -> array"""
+    raw = np.array([_raw_score(tokenize(t or "")) for t in texts], dtype=float)
+    return raw / np.sqrt(raw * raw + NORMALIZE_ALPHA)
+
+
+def entry_id(entry):
+    """Stable id for a feed entry (guid, else link, else title)"""
+    return entry.get("id") or entry.get("link") or entry.get("title", "")
+
+
+def entry_time(entry, default=None):
+    """Publish time of a feed entry as a UTC epoch (falls back to `default` / now)"""
+    parsed = entry.get("published_parsed")
+    if parsed:
+        return float(calendar.timegm(parsed))
+    try:
+        return parsedate_to_datetime(entry.get("published")).timestamp()
+    except (TypeError, ValueError):
+        return time.time() if default is None else default
+
+
+class SentimentCache:
+    """Headline scores keyed by entry id, shared across users, plus per-ticker membership"""
+
+    def __init__(self):
+        self.scores = {}    # entry id -> (published epoch, score, title)
+        self.tickers = {}   # symbol -> set of entry ids
+        self._lock = threading.Lock()
+
+    def ingest(self, symbol, entries):
+        """Score the entries not seen before (one batch) and attach them all to `symbol`"""
+        with self._lock:
+            fresh = {}
+            for entry in entries:
+                key = entry_id(entry)
+                if key and key not in self.scores and key not in fresh:
+                    fresh[key] = entry
+            if fresh:
+                titles = [e.get("title", "") for e in fresh.values()]
+                for (key, entry), score in zip(fresh.items(), score_batch(titles)):
+                    self.scores[key] = (entry_time(entry), float(score), entry.get("title", ""))
+            self.tickers.setdefault(symbol, set()).update(entry_id(e) for e in entries)
+            return len(fresh)
+
+    def score(self, entry):
+        cached = self.scores.get(entry_id(entry))
+        return cached[1] if cached else None
+
+    def history(self, symbol):
+        """DataFrame of (Score, Title) indexed by publish time for every headline seen for `symbol`"""
+        with self._lock:
+            rows = [self.scores[key] for key in self.tickers.get(symbol, ()) if key in self.scores]
+        if not rows:
+            return pd.DataFrame(columns=["Score", "Title"], index=pd.DatetimeIndex([], tz="UTC"))
+        stamps, scores, titles = zip(*rows)
+        frame = pd.DataFrame({"Score": scores, "Title": titles},
+                             index=pd.to_datetime(np.array(stamps), unit="s", utc=True))
+        return frame.sort_index()
+
+    def aggregate(self, symbol, now=None, half_life_hours=HALF_LIFE_HOURS):
+        """Recency-weighted mean score for `symbol` (None when no headlines were seen)"""
+        with self._lock:
+            rows = [self.scores[key][:2] for key in self.tickers.get(symbol, ()) if key in self.scores]
+        if not rows:
+            return None
+        stamps, scores = np.array(rows).T
+        age_hours = np.maximum((time.time() if now is None else now) - stamps, 0) / 3600
+        weights = 0.5 ** (age_hours / half_life_hours)
+        return float(np.average(scores, weights=weights)) if weights.sum() > 0 else float(scores.mean())
+
+
+def label(score):
+    if score is None or abs(score) < NEUTRAL_BAND:
+        return "NEUTRAL ⚖️"
+    return "BULLISH 🐂" if score > 0 else "BEARISH 🐻"
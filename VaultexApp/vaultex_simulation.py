@@ -0,0 +1,93 @@
+"""Vaultex simulation - Monte Carlo outcomes for the current holdings
+
+Paths are generated in independent chunks (each with its own spawned seed), so the same
+request gives the same answer whether the chunks run inline or on a process pool.
+"""
+import multiprocessing
+import os
+import sys
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+METHODS = ("bootstrap", "normal")
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def make_pool(workers=None):
+    """Process pool for simulation chunks
+
+    Workers are spawned, not forked: the Streamlit server already runs Tornado and the API
+    thread, and a child forked while one of them holds a lock can deadlock. A spawned worker
+    re-runs __main__, which under Streamlit is the app script itself, so every worker is
+    started here with a bare __main__ in place - they only need this module.
+    """
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        # Back-to-back submits find no idle worker, so each one spawns a process now
+        list(pool.map(abs, range(workers)))
+    finally:
+        sys.modules["__main__"] = main
+    return pool
+
+
+def _simulate_chunk(task):
+    """Portfolio value per step for one chunk of paths -> float array [paths, horizon + 1]"""
+    returns, values, cash, horizon, paths, method, seed = task
+    rng = np.random.default_rng(seed)
+    if method == "bootstrap":
+        # Whole days are resampled, so the cross-asset correlation of each day is kept
+        draws = returns[rng.integers(0, len(returns), size=(paths, horizon))]
+    else:
+        mu = returns.mean(axis=0)
+        cov = np.cov(returns, rowvar=False).reshape(len(mu), len(mu))
+        chol = np.linalg.cholesky(cov + np.eye(len(mu)) * 1e-12)
+        draws = mu + rng.standard_normal((paths, horizon, len(mu))) @ chol.T
+    growth = np.exp(np.cumsum(draws, axis=1))
+    out = np.empty((paths, horizon + 1))
+    out[:, 0] = cash + values.sum()
+    out[:, 1:] = cash + growth @ values
+    return out
+
+
+def simulate(returns, values, cash=0.0, horizon=30, paths=20000, method="bootstrap",
+             chunk=2000, seed=None, executor=None, confidence=0.95):
+    """Simulate `paths` outcomes of holding `values` (PKR per asset) plus `cash` for `horizon` bars
+
+    `returns` is a [bars, assets] matrix of historical log returns. Returns a dict with the
+    percentile `bands` per step, the `final` values, `prob_loss`, `var` and `expected_shortfall`
+    (both as positive PKR losses at `confidence`).
+    """
+    if method not in METHODS:
+        raise ValueError(f"UNKNOWN METHOD {method}")
+    returns = np.nan_to_num(np.asarray(returns, dtype=float))
+    values = np.asarray(values, dtype=float)
+    if returns.ndim != 2 or returns.shape[1] != len(values) or len(returns) < 2:
+        raise ValueError("NEED A RETURN HISTORY FOR EVERY HOLDING")
+
+    sizes = [chunk] * (paths // chunk) + ([paths % chunk] if paths % chunk else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(returns, values, float(cash), horizon, n, method, s) for n, s in zip(sizes, seeds)]
+    runner = map if executor is None else executor.map
+    path_values = np.concatenate(list(runner(_simulate_chunk, tasks)))
+
+    start = path_values[0, 0]
+    final = path_values[:, -1]
+    pnl = final - start
+    bands = pd.DataFrame(np.percentile(path_values, PERCENTILES, axis=0).T,
+                         columns=[f"P{p}" for p in PERCENTILES])
+    cutoff = np.quantile(pnl, 1 - confidence)
+    tail = pnl[pnl <= cutoff]
+    return {
+        "bands": bands,
+        "final": final,
+        "start": start,
+        "prob_loss": float((pnl < 0).mean()),
+        "var": float(-cutoff),
+        "expected_shortfall": float(-tail.mean()) if len(tail) else 0.0,
+    }
@@ -0,0 +1,105 @@
+"""Vaultex trade statistics - running accumulators updated once per closed trade
+
+Every figure is derived from a handful of sums that `observe()` updates in O(1), so the
+Analytics tab never rescans the trade log.
+"""
+import math
+
+from vaultex_money import MONEY_SCALE
+
+
+class TradeStats:
+    """Win rate, payoff, expectancy, holding period, Sharpe/Sortino and drawdown of closed trades
+
+    A "trade" is one fill that closes (part of) a position: its realized P&L in paisa, the cost
+    of the lots it closed, and how long those lots were held.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.wins = 0
+        self.losses = 0
+        self.gross_win = 0       # paisa
+        self.gross_loss = 0      # paisa, positive
+        self.net = 0             # cumulative realized P&L, paisa
+        self.peak = 0
+        self.max_drawdown = 0    # paisa, positive
+        self.mean_return = 0.0   # Welford mean / M2 of per-trade returns
+        self.m2_return = 0.0
+        self.downside_sq = 0.0   # sum of squared negative returns
+        self.mean_hold = 0.0     # running mean holding period, seconds
+
+    def observe(self, pnl, cost, held_seconds):
+        """Fold one closed trade into the accumulators"""
+        self.count += 1
+        if pnl > 0:
+            self.wins += 1
+            self.gross_win += pnl
+        elif pnl < 0:
+            self.losses += 1
+            self.gross_loss -= pnl
+
+        self.net += pnl
+        self.peak = max(self.peak, self.net)
+        self.max_drawdown = max(self.max_drawdown, self.peak - self.net)
+
+        ret = pnl / abs(cost) if cost else 0.0
+        delta = ret - self.mean_return
+        self.mean_return += delta / self.count
+        self.m2_return += delta * (ret - self.mean_return)
+        if ret < 0:
+            self.downside_sq += ret * ret
+        self.mean_hold += (held_seconds - self.mean_hold) / self.count
+
+    @property
+    def win_rate(self):
+        return self.wins / self.count * 100 if self.count else 0.0
+
+    @property
+    def avg_win(self):
+        return self.gross_win / self.wins / MONEY_SCALE if self.wins else 0.0
+
+    @property
+    def avg_loss(self):
+        return -self.gross_loss / self.losses / MONEY_SCALE if self.losses else 0.0
+
+    @property
+    def profit_factor(self):
+        if self.gross_loss:
+            return self.gross_win / self.gross_loss
+        return math.inf if self.gross_win else 0.0
+
+    @property
+    def expectancy(self):
+        """Average realized P&L per trade, PKR"""
+        return self.net / self.count / MONEY_SCALE if self.count else 0.0
+
+    @property
+    def sharpe(self):
+        """Per-trade Sharpe ratio (mean / std of trade returns, not annualized)"""
+        if self.count < 2:
+            return math.nan
+        std = math.sqrt(self.m2_return / (self.count - 1))
+        return self.mean_return / std if std > 0 else math.nan
+
+    @property
+    def sortino(self):
+        """Per-trade Sortino ratio (mean / downside deviation of trade returns)"""
+        if self.count < 2:
+            return math.nan
+        downside = math.sqrt(self.downside_sq / self.count)
+        return self.mean_return / downside if downside > 0 else math.nan
+
+    def summary(self):
+        return {
+            "Trades": self.count,
+            "Win Rate %": self.win_rate,
+            "Avg Win": self.avg_win,
+            "Avg Loss": self.avg_loss,
+            "Profit Factor": self.profit_factor,
+            "Expectancy": self.expectancy,
+            "Avg Holding (s)": self.mean_hold,
+            "Sharpe": self.sharpe,
+            "Sortino": self.sortino,
+            "Max Drawdown": self.max_drawdown / MONEY_SCALE,
+        }
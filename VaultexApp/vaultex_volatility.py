@@ -0,0 +1,85 @@
+"""Vaultex volatility - realized volatility over several windows, volatility cones, ATR sizing
+
+Rolling standard deviations for every window come from one pair of cumulative sums
+(sum r and sum r^2), so adding windows costs a subtraction each, not another pass.
+"""
+import numpy as np
+import pandas as pd
+
+from vaultex_execution import is_crypto
+from vaultex_money import QTY_SCALE
+
+VOL_WINDOWS = (10, 20, 60, 120)
+CONE_PERCENTILES = (0, 25, 50, 75, 100)
+TRADING_DAYS = 252
+CALENDAR_DAYS = 365
+
+
+def periods_per_year(symbol):
+    """Daily bars per year - every calendar day for crypto, trading days for the rest"""
+    return CALENDAR_DAYS if is_crypto(symbol) else TRADING_DAYS
+
+
+def log_returns(closes):
+    closes = np.asarray(closes, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.diff(np.log(closes))
+
+
+def realized_vol(closes, windows=VOL_WINDOWS, periods_per_year=TRADING_DAYS):
+    """Annualized rolling volatility (%) for each window -> DataFrame aligned to `closes`"""
+    index = closes.index if isinstance(closes, pd.Series) else None
+    r = np.nan_to_num(log_returns(closes))
+    s1 = np.concatenate([[0.0], np.cumsum(r)])
+    s2 = np.concatenate([[0.0], np.cumsum(r * r)])
+    out = {}
+    for w in windows:
+        vol = np.full(len(r) + 1, np.nan)
+        if len(r) >= w:
+            total = s1[w:] - s1[:-w]
+            squares = s2[w:] - s2[:-w]
+            var = np.maximum(squares - total * total / w, 0.0) / (w - 1)
+            vol[w:] = np.sqrt(var * periods_per_year) * 100
+        out[w] = vol
+    return pd.DataFrame(out, index=index)
+
+
+def vol_cone(closes, windows=VOL_WINDOWS, percentiles=CONE_PERCENTILES, periods_per_year=TRADING_DAYS):
+    """Percentiles of each window's rolling volatility over the whole history, plus the current value"""
+    vols = realized_vol(closes, windows, periods_per_year)
+    rows = {}
+    for w in windows:
+        history = vols[w].dropna().to_numpy()
+        if len(history) == 0:
+            continue
+        row = dict(zip([f"P{p}" for p in percentiles], np.percentile(history, percentiles)))
+        row["Current"] = history[-1]
+        rows[w] = row
+    return pd.DataFrame.from_dict(rows, orient="index").rename_axis("Window")
+
+
+def atr(bars, n=14):
+    """Average True Range (Wilder smoothing) -> Series aligned to `bars`"""
+    prev_close = bars["Close"].shift(1)
+    true_range = pd.concat([
+        bars["High"] - bars["Low"],
+        (bars["High"] - prev_close).abs(),
+        (bars["Low"] - prev_close).abs(),
+    ], axis=1).max(axis=1)
+    return true_range.ewm(alpha=1 / n, adjust=False, min_periods=n).mean()
+
+
+def position_size(risk, atr_value, multiple=2.0, price=None, cash=None, whole=True):
+    """Units so that a stop `multiple` x ATR away loses about `risk` PKR (capped by cash)
+
+    Whole units unless `whole` is False; fractional sizes round down to the ledger's 1e-8 unit.
+    """
+    stop = multiple * atr_value
+    if not stop or stop <= 0 or np.isnan(stop):
+        return 0
+    qty = risk / stop
+    if price and cash is not None:
+        qty = min(qty, cash / price)
+    if whole:
+        return max(int(qty), 0)
+    return max(float(np.floor(round(qty * QTY_SCALE, 6)) / QTY_SCALE), 0.0)
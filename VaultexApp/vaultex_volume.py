@@ -0,0 +1,158 @@
+"""Vaultex volume overlays - session-anchored VWAP with deviation bands, and a volume profile
+
+Both are kept as running state over the loaded bars: prefix sums of price x volume, volume
+and price^2 x volume give VWAP and its standard deviation for any session as two
+subtractions, and the profile is a volume-per-price-bucket array. A live tick (the last bar
+revised) or a new bar only touches the affected rows; a different window triggers a rebuild.
+"""
+import numpy as np
+import pandas as pd
+
+_PV, _V, _P2V = 0, 1, 2
+
+
+class VolumeOverlay:
+    """Incremental VWAP / volume profile for one (symbol, timeframe) series"""
+
+    def __init__(self, profile_rows=40, fine_per_row=4):
+        self.profile_rows = profile_rows
+        self.fine_per_row = fine_per_row
+        self._reset()
+
+    def _reset(self):
+        self.n = 0
+        self._times = np.zeros(0, dtype=np.int64)
+        self._cum = np.zeros((1, 3))                 # prefix sums, row i = bars [0, i)
+        self._anchor = np.zeros(0, dtype=np.int64)   # prefix row where each bar's session starts
+        self._keys = np.zeros(0, dtype=np.int64)     # session key per bar
+        self._terms = np.zeros((0, 3))               # per-bar (pv, v, p2v)
+        self._buckets = np.zeros(0, dtype=np.int64)  # profile bucket per bar
+        self._profile = np.zeros(0)
+        self._base = 0
+        self._step = 1.0
+        self._intraday = True
+
+    def _reserve(self, size):
+        capacity = len(self._times)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, 64)
+        grow = lambda a, shape: np.concatenate([a, np.zeros(shape, dtype=a.dtype)])
+        extra = capacity - len(self._times)
+        self._times = grow(self._times, extra)
+        self._cum = grow(self._cum, (extra, 3))
+        self._anchor = grow(self._anchor, extra)
+        self._keys = grow(self._keys, extra)
+        self._terms = grow(self._terms, (extra, 3))
+        self._buckets = grow(self._buckets, extra)
+
+    @staticmethod
+    def _contributions(bars):
+        typical = ((bars["High"] + bars["Low"] + bars["Close"]) / 3).to_numpy(dtype=float)
+        volume = np.nan_to_num(bars["Volume"].to_numpy(dtype=float))
+        return typical, np.column_stack([typical * volume, volume, typical * typical * volume])
+
+    def _session_keys(self, index):
+        if not self._intraday:
+            return np.zeros(len(index), dtype=np.int64)  # daily bars: anchored at the window start
+        return (index.normalize().as_unit("ns").asi8 // 86_400_000_000_000).astype(np.int64)
+
+    def _bucket(self, price):
+        return np.floor(np.nan_to_num(price) / self._step).astype(np.int64)
+
+    def _add_profile(self, buckets, volume):
+        lo, hi = buckets.min(), buckets.max()
+        if len(self._profile) == 0:
+            self._base = lo
+        if lo < self._base:
+            self._profile = np.concatenate([np.zeros(self._base - lo), self._profile])
+            self._base = lo
+        if hi - self._base >= len(self._profile):
+            self._profile = np.concatenate([self._profile, np.zeros(hi - self._base + 1 - len(self._profile))])
+        np.add.at(self._profile, buckets - self._base, volume)
+
+    def _rebuild(self, bars, times):
+        self._reset()
+        index = pd.DatetimeIndex(bars.index)
+        spacing = np.median(np.diff(times)) if len(times) > 1 else 0
+        self._intraday = 0 < spacing < 86_400_000_000_000
+        span = float(bars["High"].max() - bars["Low"].min())
+        self._step = span / (self.profile_rows * self.fine_per_row) if span > 0 else max(abs(float(bars["Close"].iloc[-1])), 1.0) * 1e-3
+        self._append(bars, times, index)
+
+    def _append(self, bars, times, index):
+        k = len(times)
+        if k == 0:
+            return
+        start = self.n
+        self._reserve(start + k)
+        typical, terms = self._contributions(bars)
+        keys = self._session_keys(index)
+        rows = np.arange(start, start + k)
+
+        self._times[start:start + k] = times
+        self._terms[start:start + k] = terms
+        self._cum[start + 1:start + k + 1] = self._cum[start] + np.cumsum(terms, axis=0)
+        prev_key = self._keys[start - 1] if start else None
+        new_session = np.concatenate([[prev_key is None or keys[0] != prev_key], keys[1:] != keys[:-1]])
+        carried = self._anchor[start - 1] if start else 0
+        self._anchor[start:start + k] = np.maximum.accumulate(np.where(new_session, rows, carried))
+        self._keys[start:start + k] = keys
+        self._buckets[start:start + k] = self._bucket(typical)
+        self._add_profile(self._buckets[start:start + k], terms[:, _V])
+        self.n += k
+
+    def _revise_last(self, bar):
+        """O(1): replace the last bar's contribution after a live tick"""
+        i = self.n - 1
+        typical, terms = self._contributions(bar)
+        old_bucket, old_volume = self._buckets[i], self._terms[i, _V]
+        self._profile[old_bucket - self._base] -= old_volume
+        self._terms[i] = terms[0]
+        self._cum[i + 1] = self._cum[i] + terms[0]
+        self._buckets[i] = self._bucket(typical)[0]
+        self._add_profile(self._buckets[i:i + 1], terms[:, _V])
+
+    def update(self, bars):
+        """Bring the overlay in line with `bars` (same window plus revised / appended bars)"""
+        times = pd.DatetimeIndex(bars.index).as_unit("ns").asi8
+        n = self.n
+        same_window = (n > 0 and len(times) >= n and times[0] == self._times[0]
+                       and times[n - 1] == self._times[n - 1])
+        if not same_window:
+            self._rebuild(bars, times)
+            return self
+        self._revise_last(bars.iloc[n - 1:n])
+        if len(times) > n:
+            self._append(bars.iloc[n:], times[n:], pd.DatetimeIndex(bars.index[n:]))
+        return self
+
+    def vwap(self, index=None):
+        """DataFrame with VWAP and 1 / 2 standard-deviation bands for every bar"""
+        n = self.n
+        end = self._cum[1:n + 1]
+        start = self._cum[self._anchor[:n]]
+        session = end - start
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vwap = np.where(session[:, _V] > 0, session[:, _PV] / session[:, _V], np.nan)
+            var = np.where(session[:, _V] > 0, session[:, _P2V] / session[:, _V] - vwap * vwap, np.nan)
+        std = np.sqrt(np.maximum(var, 0.0))
+        return pd.DataFrame({
+            "VWAP": vwap,
+            "Upper 1σ": vwap + std, "Lower 1σ": vwap - std,
+            "Upper 2σ": vwap + 2 * std, "Lower 2σ": vwap - 2 * std,
+        }, index=index)
+
+    def profile(self, rows=None):
+        """(price centers, volume) of the profile regrouped into `rows` display buckets"""
+        rows = rows or self.profile_rows
+        if not len(self._profile) or self._profile.sum() <= 0:
+            return np.zeros(0), np.zeros(0)
+        centers = (np.arange(len(self._profile)) + self._base + 0.5) * self._step
+        volume, edges = np.histogram(centers, bins=rows, weights=self._profile)
+        return (edges[:-1] + edges[1:]) / 2, volume
+
+    def point_of_control(self):
+        """Price bucket with the most traded volume"""
+        centers, volume = self.profile()
+        return float(centers[np.argmax(volume)]) if len(volume) else float("nan")